@@ -1,4 +1,109 @@
-from typing import Any, Dict, List
+import io
+import logging
+import operator
+import sys
+from typing import Any, Dict, Iterable, List, Sequence
+
+logger = logging.getLogger(__name__)
+
+NULL = "NULL"
+
+
+def _format_table(column_names: List[str], data_rows_formatted: Iterable[str]) -> str:
+    """
+    Common formatting part for table output.
+    Rows are written straight into a StringIO buffer, so large results never build an intermediate list.
+    """
+    if not column_names:
+        return "No column names found in the result."
+
+    header = " | ".join(column_names)
+    buf = io.StringIO()
+    write = buf.write
+    write(header)
+    write("\n")
+    write("-" * len(header))
+
+    has_rows = False
+    for row_line in data_rows_formatted:
+        write("\n")
+        write(row_line)
+        has_rows = True
+    if not has_rows:
+        write("\nNo data rows found.")
+
+    return buf.getvalue()
+
+
+def _format_value_row(row: Sequence[Any]) -> str:
+    """
+    Joins one row's values with " | ", rendering None as NULL.
+    The Statement Execution API returns every value as a string, so rows without NULLs are joined
+    as-is; per-value str() calls are only made for rows holding other types.
+    """
+    try:
+        if None in row:
+            return " | ".join([NULL if value is None else value for value in row])
+        return " | ".join(row)
+    except TypeError:
+        return " | ".join([NULL if value is None else str(value) for value in row])
+
+
+def _format_value_rows(column_names: List[str], rows: Iterable[Sequence[Any]]) -> str:
+    """Format rows given as sequences of values in column order."""
+    return _format_table(column_names, map(_format_value_row, rows))
+
+
+def _format_sdk_result(result: Dict[str, Any]) -> str:
+    """Format output from execute_databricks_sql (SDK based)."""
+    logger.debug("Formatting results from SDK-based execute_databricks_sql output.")
+    column_names: List[str] = result.get("columns") or []
+    sdk_data = result.get("data") or []
+
+    if not sdk_data: # No rows, but query was successful
+        if column_names:
+            return _format_table(column_names, ())
+        return "Query succeeded but returned no data."
+
+    if isinstance(sdk_data[0], dict):
+        # Rows requested with as_dicts=True: extract values in column order.
+        # itemgetter pulls every column of a row in one C-level call.
+        column_names = column_names or list(map(sys.intern, sdk_data[0].keys()))
+        if len(column_names) == 1:
+            single_column = column_names[0]
+            get_values = lambda row_dict: (row_dict[single_column],)
+        else:
+            get_values = operator.itemgetter(*column_names)
+        return _format_value_rows(column_names, map(get_values, sdk_data))
+
+    # Columnar output: rows are already value lists in column order, same as the direct API style
+    return _format_value_rows(column_names, sdk_data)
+
+
+def _format_dbapi_result(result: Dict[str, Any]) -> str:
+    """Format old direct API style output (from dbapi.execute_statement)."""
+    logger.debug("Formatting results from original dbapi.execute_statement output.")
+    column_names: List[str] = []
+
+    if result['manifest'].get('schema') and result['manifest']['schema'].get('columns'):
+        columns_schema = result['manifest']['schema']['columns']
+        column_names = [col['name'] for col in columns_schema if 'name' in col] if columns_schema else []
+
+    return _format_value_rows(column_names, result['result'].get('data_array') or ())
+
+
+def _format_error_result(result: Dict[str, Any]) -> str:
+    """Fallback if structure is completely unrecognized or an error dict itself."""
+    if result.get("status") == "error" and result.get("error"):
+        return f"Error from query execution: {result.get('error')} Details: {result.get('details', 'N/A')}"
+    return "Invalid or unrecognized result format."
+
+
+_RESULT_FORMATTERS = {
+    "sdk": _format_sdk_result,
+    "dbapi": _format_dbapi_result,
+    "error": _format_error_result,
+}
 
 
 def format_query_results(result: Dict[str, Any]) -> str:
@@ -6,76 +111,12 @@ def format_query_results(result: Dict[str, Any]) -> str:
 
     if not result:
         return "No results or invalid result format."
-    
-    column_names: List[str] = []
-    rows: List[List[Any]] = [] # For new style, this will be list of dicts initially
-    data_rows_formatted: List[str] = []
-
-    # Try to parse as output from execute_databricks_sql (SDK based)
-    if result.get("status") == "success" and "data" in result:
-        print("Formatting results from SDK-based execute_databricks_sql output.")
-        sdk_data = result.get("data", [])
-        if not sdk_data: # No rows, but query was successful
-            # Try to get column names if available even with no data (e.g., from a manifest if we adapt execute_databricks_sql later)
-            # For now, if no data, we might not have explicit column names easily in this path.
-            # However, execute_databricks_sql returns column names implicit in the (empty) list of dicts.
-            # This part needs careful handling if sdk_data is empty but we still want headers.
-            # Let's assume if sdk_data is empty, we might not have columns easily unless manifest is also passed.
-            # For now, if sdk_data is empty, we report no data rows. Future improvement: get columns from manifest if possible.
-            if result.get("message") == "Query succeeded but returned no data.":
-                 # If we had column names from execute_databricks_sql (e.g. if it returned them separately)
-                 # we could print headers. For now, this message is sufficient.
-                return "Query succeeded but returned no data."
-            return "Query succeeded but returned no data rows."
-
-        # Assuming sdk_data is a list of dictionaries, get column names from the first row's keys
-        if isinstance(sdk_data, list) and len(sdk_data) > 0 and isinstance(sdk_data[0], dict):
-            column_names = list(sdk_data[0].keys())
-        
-        for row_dict in sdk_data:
-            row_values = []
-            for col_name in column_names: # Iterate in order of discovered column names
-                value = row_dict.get(col_name)
-                if value is None:
-                    row_values.append("NULL")
-                else:
-                    row_values.append(str(value))
-            data_rows_formatted.append(" | ".join(row_values))
-    
-    # Try to parse as old direct API style output (from dbapi.execute_statement)
-    elif 'manifest' in result and 'result' in result:
-        print("Formatting results from original dbapi.execute_statement output.")
-        if result['manifest'].get('schema') and result['manifest']['schema'].get('columns'):
-            columns_schema = result['manifest']['schema']['columns']
-            column_names = [col['name'] for col in columns_schema if 'name' in col] if columns_schema else []
-        
-        if result['result'].get('data_array'):
-            raw_rows = result['result']['data_array']
-            for row_list in raw_rows:
-                row_values = []
-                for value in row_list:
-                    if value is None:
-                        row_values.append("NULL")
-                    else:
-                        row_values.append(str(value))
-                data_rows_formatted.append(" | ".join(row_values))
-    else:
-        # Fallback if structure is completely unrecognized or an error dict itself
-        if result.get("status") == "error" and result.get("error"):
-            return f"Error from query execution: {result.get('error')} Details: {result.get('details', 'N/A')}"
-        return "Invalid or unrecognized result format."
-
-    # Common formatting part for table output
-    if not column_names:
-        return "No column names found in the result."
-    
-    output_lines = []
-    output_lines.append(" | ".join(column_names))
-    output_lines.append("-" * (sum(len(name) + 3 for name in column_names) - 1 if column_names else 0))
 
-    if not data_rows_formatted:
-        output_lines.append("No data rows found.")
+    # "data" is only present in successful execute_databricks_sql output
+    if "data" in result:
+        shape = "sdk"
+    elif "manifest" in result and "result" in result:
+        shape = "dbapi"
     else:
-        output_lines.extend(data_rows_formatted)
-    
-    return "\n".join(output_lines) 
\ No newline at end of file
+        shape = "error"
+    return _RESULT_FORMATTERS[shape](result)
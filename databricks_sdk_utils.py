@@ -1,16 +1,47 @@
 from databricks.sdk import WorkspaceClient
 from databricks.sdk.core import Config
 from databricks.sdk.service.catalog import TableInfo, SchemaInfo, ColumnInfo, CatalogInfo
-from databricks.sdk.service.sql import StatementResponse, StatementState
-from typing import Dict, Any, List
+from databricks.sdk.service.workspace import ObjectType
+from databricks.sdk.service.sql import StatementResponse, StatementState, StatementParameterListItem, ExecuteStatementRequestOnWaitTimeout
+from typing import Dict, Any, Iterable, Iterator, List, Mapping, Optional
+from types import MappingProxyType
+from concurrent.futures import ThreadPoolExecutor
 import os
+import re
+import sys
+import logging
+import asyncio
+import atexit
+import collections
+import functools
+import io
+import itertools
+import operator
 import json
+import sqlite3
+import threading
 import time
+import httpx
 from dotenv import load_dotenv
+try:
+    # orjson parses lineage entity metadata several times faster when it is installed;
+    # its JSONDecodeError subclasses json.JSONDecodeError, so error handling is shared
+    import orjson as _json
+except ImportError:
+    _json = json
+try:
+    # With h2 installed, the async Statement Execution client speaks HTTP/2
+    import h2  # noqa: F401
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+from databricks_formatter import format_query_results
 
 # Load environment variables from .env file when the module is imported
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 DATABRICKS_HOST = os.environ.get("DATABRICKS_HOST")
 DATABRICKS_TOKEN = os.environ.get("DATABRICKS_TOKEN")
 DATABRICKS_SQL_WAREHOUSE_ID = os.environ.get("DATABRICKS_SQL_WAREHOUSE_ID")
@@ -21,80 +52,572 @@ if not DATABRICKS_HOST or not DATABRICKS_TOKEN:
         "for databricks_sdk_utils to initialize."
     )
 
+# Upper bound on concurrent jobs/workspace API calls while pre-loading lineage metadata
+_METADATA_PREFETCH_WORKERS = 16
+# Upper bound on concurrent lineage queries, kept small to stay within the warehouse's concurrency limit
+_LINEAGE_QUERY_WORKERS = 8
+# Upper bound on concurrent tool calls running blocking SDK code; set DATABRICKS_TOOL_WORKERS to resize
+_TOOL_CALL_WORKERS = int(os.environ.get("DATABRICKS_TOOL_WORKERS", "16"))
+# HTTP connections kept by the SDK client. The pool blocks when exhausted, so it is sized to
+# cover every executor below.
+_SDK_HTTP_POOL_SIZE = _METADATA_PREFETCH_WORKERS + _LINEAGE_QUERY_WORKERS + _TOOL_CALL_WORKERS
+
 # Configure and initialize the global SDK client
 # Using short timeouts as previously determined to be effective
 sdk_config = Config(
     host=DATABRICKS_HOST,
     token=DATABRICKS_TOKEN,
     http_timeout_seconds=30,
-    retry_timeout_seconds=60
+    retry_timeout_seconds=60,
+    max_connection_pools=_SDK_HTTP_POOL_SIZE,
+    max_connections_per_pool=_SDK_HTTP_POOL_SIZE
 )
 sdk_client = WorkspaceClient(config=sdk_config)
 
-# Cache for job information to avoid redundant API calls
-_job_cache = {}
-_notebook_cache = {}
+# Long-lived worker threads shared by every call, so no request pays thread start-up cost.
+# _SDK_EXECUTOR only runs leaf SDK calls that never wait on other pool work. Lineage queries,
+# which pre-load job metadata on _SDK_EXECUTOR, run on their own pool so they can never
+# occupy every _SDK_EXECUTOR thread while waiting on tasks queued behind them.
+_SDK_EXECUTOR = ThreadPoolExecutor(max_workers=_METADATA_PREFETCH_WORKERS, thread_name_prefix="dbx-sdk")
+_LINEAGE_EXECUTOR = ThreadPoolExecutor(max_workers=_LINEAGE_QUERY_WORKERS, thread_name_prefix="dbx-lineage")
+# Tool calls get their own threads rather than asyncio's default executor, so they never
+# queue behind unrelated blocking work (DNS lookups, file I/O) sharing that executor.
+_TOOL_EXECUTOR = ThreadPoolExecutor(max_workers=_TOOL_CALL_WORKERS, thread_name_prefix="dbx-tool")
+atexit.register(_SDK_EXECUTOR.shutdown, wait=False)
+atexit.register(_LINEAGE_EXECUTOR.shutdown, wait=False)
+atexit.register(_TOOL_EXECUTOR.shutdown, wait=False)
+
+# Sentinel for cache lookups where None is a valid cached value
+_CACHE_MISS = object()
+
+class _SqliteStore:
+    """
+    Persists JSON-serializable cache entries in a sqlite file so they survive server restarts.
+    Entries are namespaced by cache name and workspace host, and expire by wall-clock time
+    since monotonic timestamps do not carry across processes.
+    The database is opened on first use; if it cannot be used, persistence is disabled.
+    Callers serialize access (the owning _TTLCache calls it under its lock).
+    """
+    def __init__(self, path: str, name: str, ttl: float):
+        self.path = path
+        self.namespace = (name, DATABRICKS_HOST)
+        self.ttl = ttl
+        self._connection: Optional[sqlite3.Connection] = None
+        self._disabled = False
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        if self._connection is None and not self._disabled:
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                connection = sqlite3.connect(self.path, check_same_thread=False)
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS cache_entries ("
+                    "cache TEXT, host TEXT, key TEXT, expires_at REAL, value TEXT, "
+                    "PRIMARY KEY (cache, host, key))"
+                )
+                self._connection = connection
+            except (OSError, sqlite3.Error) as e:
+                self._disable(e)
+        return self._connection
+
+    def _disable(self, error: Exception) -> None:
+        logger.warning("Disabling persistent metadata cache at %s: %s", self.path, error)
+        self._disabled = True
+        self._connection = None
+
+    def items(self) -> List[tuple]:
+        """
+        Returns every unexpired (key, value) pair in this store's namespace, oldest first.
+        Expired rows of every namespace are deleted first, so the file does not grow without bound.
+        """
+        connection = self._connect()
+        if connection is None:
+            return []
+        try:
+            with connection:
+                connection.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (time.time(),))
+            rows = connection.execute(
+                "SELECT key, value FROM cache_entries WHERE cache = ? AND host = ? AND expires_at > ? ORDER BY expires_at",
+                (*self.namespace, time.time())
+            ).fetchall()
+        except sqlite3.Error as e:
+            self._disable(e)
+            return []
+        return [(key, json.loads(value)) for key, value in rows]
+
+    def set(self, key: Any, value: Any) -> None:
+        connection = self._connect()
+        if connection is None:
+            return
+        try:
+            with connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO cache_entries VALUES (?, ?, ?, ?, ?)",
+                    (*self.namespace, str(key), time.time() + self.ttl, json.dumps(value))
+                )
+        except sqlite3.Error as e:
+            self._disable(e)
+
+    def delete(self, key: Any = None) -> None:
+        """Deletes one entry, or every entry in this store's namespace when key is None."""
+        connection = self._connect()
+        if connection is None:
+            return
+        try:
+            with connection:
+                if key is None:
+                    connection.execute("DELETE FROM cache_entries WHERE cache = ? AND host = ?", self.namespace)
+                else:
+                    connection.execute(
+                        "DELETE FROM cache_entries WHERE cache = ? AND host = ? AND key = ?",
+                        (*self.namespace, str(key))
+                    )
+        except sqlite3.Error as e:
+            self._disable(e)
 
-def _format_column_details_md(columns: List[ColumnInfo]) -> List[str]:
+class _TTLCache:
     """
-    Formats a list of ColumnInfo objects into a list of Markdown strings.
+    A small thread-safe dict cache whose entries expire `ttl` seconds after insertion.
+    Holds at most `maxsize` entries; when full, expired entries are dropped first and then the oldest.
+    With a `store`, entries for which `persist_if(value)` is true are also written through to it.
+    The store is read once, on first use, to warm the empty cache after a restart; entries that
+    expire in memory are never reloaded from it, so they are refetched after `ttl` seconds.
+    Keys must be strings, as the store keeps them as text.
     """
-    markdown_lines = []
-    if not columns:
-        markdown_lines.append("  - *No column information available.*")
-        return markdown_lines
+    def __init__(self, maxsize: int, ttl: float, store: Optional[_SqliteStore] = None, persist_if=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.store = store
+        self.persist_if = persist_if
+        # Insertion order is expiry order, since entries are never refreshed in place
+        self._entries: Dict[Any, tuple] = {}
+        self._lock = threading.Lock()
+        self._warmed = store is None
+
+    def _warm_from_store(self, now: float) -> None:
+        if not self._warmed:
+            self._warmed = True
+            for key, value in self.store.items():
+                self._insert(key, value, now)
+
+    def _evict_expired(self, now: float) -> None:
+        entries = self._entries
+        while entries:
+            oldest_key = next(iter(entries))
+            if entries[oldest_key][0] > now:
+                break
+            del entries[oldest_key]
+
+    def _insert(self, key: Any, value: Any, now: float) -> None:
+        self._entries.pop(key, None)
+        self._evict_expired(now)
+        while len(self._entries) >= self.maxsize:
+            del self._entries[next(iter(self._entries))]
+        self._entries[key] = (now + self.ttl, value)
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        with self._lock:
+            now = time.monotonic()
+            self._warm_from_store(now)
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            return default
 
-    for col in columns:
-        if not isinstance(col, ColumnInfo):
-            print(f"Warning: Encountered an unexpected item in columns list: {type(col)}. Skipping.")
+    def __contains__(self, key: Any) -> bool:
+        return self.get(key, _CACHE_MISS) is not _CACHE_MISS
+
+    def setdefault(self, key: Any, value: Any) -> Any:
+        """Stores value unless a fresh entry exists, and returns whichever value is cached."""
+        with self._lock:
+            now = time.monotonic()
+            self._warm_from_store(now)
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                return entry[1]
+            self._insert(key, value, now)
+            if self.store is not None and (self.persist_if is None or self.persist_if(value)):
+                self.store.set(key, value)
+            return value
+
+    def pop(self, key: Any) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+            if self.store is not None:
+                self.store.delete(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._warmed = True
+            self._entries.clear()
+            if self.store is not None:
+                self.store.delete()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+# Cache for job information to avoid redundant API calls.
+# Entries expire so a long-running server does not serve stale job metadata forever.
+_LINEAGE_METADATA_CACHE_TTL_SECONDS = 300
+# Successful job and notebook lookups are also persisted on disk for an hour, so a restarted
+# server starts warm. Set DATABRICKS_METADATA_CACHE_DIR to an empty value to disable this.
+_PERSISTED_METADATA_TTL_SECONDS = 3600
+METADATA_CACHE_DIR = os.path.expanduser(os.environ.get("DATABRICKS_METADATA_CACHE_DIR", "~/.cache/databricks-mcp"))
+
+def _metadata_store(name: str) -> Optional[_SqliteStore]:
+    if not METADATA_CACHE_DIR:
+        return None
+    return _SqliteStore(os.path.join(METADATA_CACHE_DIR, "lineage_metadata.sqlite"), name, _PERSISTED_METADATA_TTL_SECONDS)
+
+# Failed lookups stay in memory only, so they are retried after a restart
+_job_cache = _TTLCache(
+    maxsize=4096, ttl=_LINEAGE_METADATA_CACHE_TTL_SECONDS,
+    store=_metadata_store("jobs"), persist_if=lambda job_entry: 'error' not in job_entry
+)
+_notebook_cache = _TTLCache(
+    maxsize=16384, ttl=_LINEAGE_METADATA_CACHE_TTL_SECONDS,
+    store=_metadata_store("notebooks"), persist_if=lambda notebook_id: notebook_id is not None
+)
+
+# Cache for SQL query results, keyed by (normalized SQL, parameters, warehouse ID, row limit).
+# At most _QUERY_CACHE_MAX_ENTRIES results are kept; the oldest are dropped first. Results with more
+# than _QUERY_CACHE_MAX_ROWS rows or _QUERY_CACHE_MAX_BYTES bytes are never cached, so memory
+# stays bounded instead of holding up to 256 full-size result chunks.
+# Set DATABRICKS_QUERY_CACHE_TTL to 0 to disable result caching.
+QUERY_CACHE_TTL_SECONDS = float(os.environ.get("DATABRICKS_QUERY_CACHE_TTL", "60"))
+_QUERY_CACHE_MAX_ENTRIES = 256
+_QUERY_CACHE_MAX_ROWS = 1000
+_QUERY_CACHE_MAX_BYTES = 1024 * 1024
+_query_cache = _TTLCache(maxsize=_QUERY_CACHE_MAX_ENTRIES, ttl=QUERY_CACHE_TTL_SECONDS)
+
+_SQL_QUOTED_PATTERN = re.compile(r"('(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"|`[^`]*`)")
+# Comments and quoted parts are matched by one alternation, scanning left to right, so a quote
+# character inside a comment or a comment marker inside a literal is never mistaken for the other
+_SQL_COMMENT_OR_QUOTED_PATTERN = re.compile(r"(--[^\n]*|/\*.*?\*/)|('(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"|`[^`]*`)", re.DOTALL)
+_SQL_WHITESPACE_PATTERN = re.compile(r"\s+")
+# Only read-only statements are safe to serve from the cache. A WITH is cacheable only when the
+# statement following its common table expressions is a SELECT, since CTEs may also precede INSERT or MERGE.
+_CACHEABLE_STATEMENT_PREFIXES = ("select", "show", "describe", "desc")
+_SQL_STRUCTURE_TOKEN_PATTERN = re.compile(r"[(),]|\w+")
+
+def _normalize_sql(sql_query: str) -> str:
+    """
+    Normalizes SQL text so that queries differing only in formatting share a cache entry.
+    Comments are stripped, whitespace is collapsed and everything outside quoted
+    literals/identifiers is lowercased.
+    """
+    parts = []
+    unquoted = []
+    position = 0
+    for match in _SQL_COMMENT_OR_QUOTED_PATTERN.finditer(sql_query):
+        unquoted.append(sql_query[position:match.start()])
+        position = match.end()
+        comment, quoted = match.groups()
+        if comment is not None:
+            unquoted.append(" ")
+        else:
+            parts.append(_SQL_WHITESPACE_PATTERN.sub(" ", "".join(unquoted)).lower())
+            parts.append(quoted)
+            unquoted = []
+    unquoted.append(sql_query[position:])
+    parts.append(_SQL_WHITESPACE_PATTERN.sub(" ", "".join(unquoted)).lower())
+    return "".join(parts).strip().rstrip(";").rstrip()
+
+def _with_statement_is_select(normalized_sql: str) -> bool:
+    """
+    Tells whether a normalized `WITH ...` statement is a query: the first token after the last
+    top-level CTE definition (`name [(columns)] AS (...)`, comma separated) must be `select`.
+    """
+    depth = 0
+    after_definition = False
+    # Even indices are unquoted SQL; quoted literals and identifiers cannot affect the structure
+    for i, part in enumerate(_SQL_QUOTED_PATTERN.split(normalized_sql)):
+        if i % 2:
             continue
-        col_type = col.type_text or (col.type_name.value if col.type_name and hasattr(col.type_name, 'value') else "N/A")
-        nullable_status = "nullable" if col.nullable else "not nullable"
-        col_description = f": {col.comment}" if col.comment else ""
-        markdown_lines.append(f"  - **{col.name}** (`{col_type}`, {nullable_status}){col_description}")
-    return markdown_lines
+        for token in _SQL_STRUCTURE_TOKEN_PATTERN.findall(part):
+            if token == "(":
+                if after_definition:
+                    return False
+                depth += 1
+            elif token == ")":
+                depth -= 1
+                after_definition = depth == 0
+            elif depth == 0 and after_definition:
+                if token not in (",", "as"):
+                    return token == "select"
+                after_definition = False
+    return False
+
+def _is_read_only_sql(normalized_sql: str) -> bool:
+    if normalized_sql.startswith("with"):
+        return _with_statement_is_select(normalized_sql)
+    return normalized_sql.startswith(_CACHEABLE_STATEMENT_PREFIXES)
+
+def _get_cached_query_result(cache_key: tuple) -> Optional[Dict[str, Any]]:
+    """Returns a cached query result if it is still fresh"""
+    return _query_cache.get(cache_key)
+
+def clear_query_cache():
+    """Clear the SQL query result cache"""
+    _query_cache.clear()
+    logger.info("Cleared query result cache")
+
+def _invalidate_query_cache_after(sql_query: str) -> None:
+    """Drops every cached result after a statement that may have changed data has succeeded"""
+    if len(_query_cache) and not _is_read_only_sql(_normalize_sql(sql_query)):
+        _query_cache.clear()
+        logger.debug("Cleared query result cache after a write statement")
+
+# Unity Catalog metadata rarely changes within a session, so SDK lookups are memoized.
+# Set DATABRICKS_METADATA_CACHE_TTL to 0 to disable metadata caching.
+METADATA_CACHE_TTL_SECONDS = int(os.environ.get("DATABRICKS_METADATA_CACHE_TTL", "300"))
+# Lineage changes more often than table metadata, so lineage lookups and the describe output
+# that includes them are kept for a shorter time. Lineage queries bypass the SQL result cache.
+LINEAGE_CACHE_TTL_SECONDS = min(30, METADATA_CACHE_TTL_SECONDS)
+
+class _UncachedResult(Exception):
+    """Carries a result that ttl_cache must return without storing it."""
+    def __init__(self, value: Any):
+        self.value = value
+
+def ttl_cache(seconds: int, maxsize: int = 256, cache_if=None):
+    """
+    Memoizes a function for up to `seconds` using functools.lru_cache.
+    The current time bucket is passed as an extra cache key, so entries from an
+    earlier bucket are never hit again and age out of the LRU.
+    Results for which `cache_if(result)` is false are returned but not cached.
+    `cache_clear()` also starts a new generation, which is part of the key as well: a call that
+    was already running when the cache was cleared stores its result under the old generation,
+    where later calls never find it.
+    """
+    def decorator(func):
+        if seconds <= 0:
+            func.cache_clear = lambda: None
+            return func
+
+        generation = 0
+
+        @functools.lru_cache(maxsize=maxsize)
+        def cached_call(cache_generation: int, time_bucket: int, *args, **kwargs):
+            result = func(*args, **kwargs)
+            if cache_if is not None and not cache_if(result):
+                # lru_cache never stores calls that raise
+                raise _UncachedResult(result)
+            return result
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                return cached_call(generation, int(time.monotonic() // seconds), *args, **kwargs)
+            except _UncachedResult as uncached:
+                return uncached.value
+
+        def cache_clear():
+            nonlocal generation
+            generation += 1
+            cached_call.cache_clear()
+
+        wrapper.cache_clear = cache_clear
+        return wrapper
+    return decorator
+
+@ttl_cache(seconds=METADATA_CACHE_TTL_SECONDS)
+def _cached_table_get(full_name: str) -> TableInfo:
+    return sdk_client.tables.get(full_name=full_name)
+
+def _iter_tables(catalog_name: str, schema_name: str, max_items: int) -> Iterator[TableInfo]:
+    # Columns arrive with the listing, so a schema never needs a tables.get per table.
+    # Table properties and owner names are never rendered, so the server is asked to leave them out.
+    # islice stops the SDK paginator once enough items were read, so later pages are never fetched
+    tables = sdk_client.tables.list(
+        catalog_name=catalog_name,
+        schema_name=schema_name,
+        omit_properties=True,
+        omit_username=True
+    )
+    return itertools.islice(tables, max_items)
+
+@ttl_cache(seconds=METADATA_CACHE_TTL_SECONDS)
+def _cached_tables_list(catalog_name: str, schema_name: str, max_items: int) -> List[TableInfo]:
+    return list(_iter_tables(catalog_name, schema_name, max_items))
+
+@ttl_cache(seconds=METADATA_CACHE_TTL_SECONDS)
+def _cached_schema_get(full_name: str) -> SchemaInfo:
+    return sdk_client.schemas.get(full_name=full_name)
+
+def _iter_schemas(catalog_name: str, max_items: int) -> Iterator[SchemaInfo]:
+    return itertools.islice(sdk_client.schemas.list(catalog_name=catalog_name), max_items)
+
+@ttl_cache(seconds=METADATA_CACHE_TTL_SECONDS)
+def _cached_schemas_list(catalog_name: str, max_items: int) -> List[SchemaInfo]:
+    return list(_iter_schemas(catalog_name, max_items))
+
+def _iter_catalogs() -> Iterator[CatalogInfo]:
+    return sdk_client.catalogs.list()
+
+@ttl_cache(seconds=METADATA_CACHE_TTL_SECONDS)
+def _cached_catalogs_list() -> List[CatalogInfo]:
+    return list(_iter_catalogs())
+
+def _list_metadata(iter_func, cached_list_func, *args) -> Iterable:
+    """
+    Returns the memoized listing while metadata caching is enabled. With caching disabled,
+    the SDK's paginated generator is returned as-is so callers render items as pages arrive.
+    """
+    if METADATA_CACHE_TTL_SECONDS > 0:
+        return cached_list_func(*args)
+    return iter_func(*args)
+
+# Each column line carries its own leading newline, so lines can be written straight into a buffer
+_format_column_line = "\n  - **{0}** (`{1}`, {2}){3}".format
+
+def _extract_column_rows(columns: Optional[List[ColumnInfo]]) -> List[tuple]:
+    """
+    Reads each ColumnInfo's attributes once into a plain tuple of
+    (name, type, nullability label, description suffix, partition index),
+    so that partition and column rendering don't go back through the SDK objects.
+    """
+    # The SDK always returns ColumnInfo objects with an enum type_name, so no type checks are needed
+    return [
+        (
+            col.name,
+            col.type_text or (col.type_name.value if col.type_name else "N/A"),
+            "nullable" if col.nullable else "not nullable",
+            f": {col.comment}" if col.comment else "",
+            col.partition_index,
+        )
+        for col in columns or ()
+    ]
+
+def _format_column_details_md(column_rows: List[tuple], buf: io.StringIO) -> None:
+    """
+    Writes column tuples from _extract_column_rows into buf as Markdown lines, each preceded by a newline.
+    """
+    if not column_rows:
+        buf.write("\n  - *No column information available.*")
+        return
+
+    write = buf.write
+    # The template only uses the first four fields; the partition index is ignored
+    for row in column_rows:
+        write(_format_column_line(*row))
+
+def _cached_in(cache: _TTLCache):
+    """
+    Memoizes a single-argument function in a _TTLCache, keyed by its argument.
+    A hit costs one locked lookup; a miss calls the function and publishes its result,
+    keeping the entry another thread may have published in the meantime.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(key):
+            value = cache.get(key, _CACHE_MISS)
+            if value is _CACHE_MISS:
+                value = cache.setdefault(key, func(key))
+            return value
+        return wrapper
+    return decorator
+
+@_cached_in(_job_cache)
+def _fetch_job_info(job_id: str) -> Dict[str, Any]:
+    """Fetches a job's name and notebook tasks; failures are reported in an 'error' entry"""
+    try:
+        job_info = sdk_client.jobs.get(job_id=job_id)
+        job_entry = {
+            'name': job_info.settings.name if job_info.settings.name else f"Job {job_id}",
+            'tasks': []
+        }
+        
+        # Pre-process all tasks to build notebook mapping
+        if job_info.settings.tasks:
+            for task in job_info.settings.tasks:
+                if hasattr(task, 'notebook_task') and task.notebook_task:
+                    task_info = {
+                        'task_key': task.task_key,
+                        'notebook_path': task.notebook_task.notebook_path
+                    }
+                    job_entry['tasks'].append(task_info)
+                    
+    except Exception as e:
+        logger.error("Error fetching job %s: %s", job_id, e)
+        job_entry = {
+            'name': f"Job {job_id}",
+            'tasks': [],
+            'error': str(e)
+        }
+
+    return job_entry
 
 def _get_job_info_cached(job_id: str) -> Dict[str, Any]:
     """Get job information with caching to avoid redundant API calls"""
-    if job_id not in _job_cache:
-        try:
-            job_info = sdk_client.jobs.get(job_id=job_id)
-            _job_cache[job_id] = {
-                'name': job_info.settings.name if job_info.settings.name else f"Job {job_id}",
-                'tasks': []
-            }
-            
-            # Pre-process all tasks to build notebook mapping
-            if job_info.settings.tasks:
-                for task in job_info.settings.tasks:
-                    if hasattr(task, 'notebook_task') and task.notebook_task:
-                        task_info = {
-                            'task_key': task.task_key,
-                            'notebook_path': task.notebook_task.notebook_path
-                        }
-                        _job_cache[job_id]['tasks'].append(task_info)
-                        
-        except Exception as e:
-            print(f"Error fetching job {job_id}: {e}")
-            _job_cache[job_id] = {
-                'name': f"Job {job_id}",
-                'tasks': [],
-                'error': str(e)
-            }
-    
-    return _job_cache[job_id]
+    return _fetch_job_info(job_id)
+
+@_cached_in(_notebook_cache)
+def _fetch_notebook_id(notebook_path: str) -> Optional[str]:
+    """Looks up a notebook's object ID, or None if it cannot be resolved"""
+    try:
+        notebook_details = sdk_client.workspace.get_status(notebook_path)
+        return str(notebook_details.object_id)
+    except Exception as e:
+        logger.error("Error fetching notebook %s: %s", notebook_path, e)
+        return None
 
 def _get_notebook_id_cached(notebook_path: str) -> str:
     """Get notebook ID with caching to avoid redundant API calls"""
-    if notebook_path not in _notebook_cache:
-        try:
-            notebook_details = sdk_client.workspace.get_status(notebook_path)
-            _notebook_cache[notebook_path] = str(notebook_details.object_id)
-        except Exception as e:
-            print(f"Error fetching notebook {notebook_path}: {e}")
-            _notebook_cache[notebook_path] = None
-    
-    return _notebook_cache[notebook_path]
+    return _fetch_notebook_id(notebook_path)
+
+def _cache_notebook_ids_in_directory(directory: str, notebook_paths: List[str]) -> None:
+    """
+    Caches the IDs of the given notebooks, all directly inside a workspace directory, with a single list call.
+    Other notebooks in the directory are skipped, so a large folder does not crowd the notebook cache.
+    """
+    wanted_paths = set(notebook_paths)
+    try:
+        for object_info in sdk_client.workspace.list(path=directory):
+            if object_info.object_type == ObjectType.NOTEBOOK and object_info.path in wanted_paths:
+                _notebook_cache.setdefault(object_info.path, str(object_info.object_id))
+    except Exception as e:
+        # Paths left unresolved here fall back to individual get_status calls
+        logger.debug("Could not list workspace directory %s: %s", directory, e)
+
+def _prefetch_lineage_metadata(job_ids) -> None:
+    """
+    Loads job details for job_ids, then resolves every notebook path those jobs reference,
+    running the API calls concurrently on the shared SDK executor. Already-cached entries are skipped.
+    """
+    missing_job_ids = [job_id for job_id in job_ids if job_id not in _job_cache]
+    if missing_job_ids:
+        # Results land in the cache; draining the iterator just waits for every lookup
+        for _ in _SDK_EXECUTOR.map(_get_job_info_cached, missing_job_ids):
+            pass
+
+    missing_paths = {
+        task['notebook_path']
+        for job_id in job_ids
+        for task in _get_job_info_cached(job_id)['tasks']
+        if task['notebook_path'] not in _notebook_cache
+    }
+    if not missing_paths:
+        return
+
+    # Notebooks tend to cluster in a few folders: a directory holding several of the
+    # missing paths is listed once instead of calling get_status for each notebook
+    paths_by_directory: Dict[str, List[str]] = {}
+    for notebook_path in missing_paths:
+        if notebook_path.startswith('/'):
+            paths_by_directory.setdefault(notebook_path.rpartition('/')[0] or '/', []).append(notebook_path)
+    shared_directories = {directory: paths for directory, paths in paths_by_directory.items() if len(paths) > 1}
+    if shared_directories:
+        for _ in _SDK_EXECUTOR.map(_cache_notebook_ids_in_directory, shared_directories.keys(), shared_directories.values()):
+            pass
+        missing_paths = {notebook_path for notebook_path in missing_paths if notebook_path not in _notebook_cache}
+
+    if missing_paths:
+        for _ in _SDK_EXECUTOR.map(_get_notebook_id_cached, missing_paths):
+            pass
 
 def _resolve_notebook_info_optimized(notebook_id: str, job_id: str) -> Dict[str, Any]:
     """
@@ -121,7 +644,7 @@ def _resolve_notebook_info_optimized(notebook_id: str, job_id: str) -> Dict[str,
         
         if cached_notebook_id == notebook_id:
             result['notebook_path'] = notebook_path
-            result['notebook_name'] = notebook_path.split('/')[-1]
+            result['notebook_name'] = notebook_path.rpartition('/')[2]
             result['task_key'] = task_info['task_key']
             break
     
@@ -131,52 +654,53 @@ def _format_notebook_info_optimized(notebook_info: Dict[str, Any]) -> str:
     """
     Formats notebook information using pre-resolved data.
     """
-    lines = []
-    
     if notebook_info['notebook_path'].startswith('/'):
-        lines.append(f"**`{notebook_info['notebook_name']}`**")
-        lines.append(f"  - **Path**: `{notebook_info['notebook_path']}`")
+        title = f"**`{notebook_info['notebook_name']}`**\n  - **Path**: `{notebook_info['notebook_path']}`"
     else:
-        lines.append(f"**{notebook_info['notebook_name']}**")
-    
-    lines.append(f"  - **Job**: {notebook_info['job_name']} (ID: {notebook_info['job_id']})")
-    if notebook_info['task_key']:
-        lines.append(f"  - **Task**: {notebook_info['task_key']}")
-    
-    return "\n".join(lines)
+        title = f"**{notebook_info['notebook_name']}**"
+    task_line = f"\n  - **Task**: {notebook_info['task_key']}" if notebook_info['task_key'] else ""
+
+    return f"{title}\n  - **Job**: {notebook_info['job_name']} (ID: {notebook_info['job_id']}){task_line}"
 
-def _process_lineage_results(lineage_query_output: Dict[str, Any], main_table_full_name: str) -> Dict[str, Any]:
+def iter_lineage_entries(lineage_query_output: Dict[str, Any], main_table_full_name: str) -> Iterator[tuple]:
     """
-    Optimized version of lineage processing that batches API calls and uses caching.
+    Yields each distinct lineage relation of main_table_full_name as a (kind, value) tuple:
+    ("upstream", table name), ("downstream", table name), ("reader", formatted notebook)
+    or ("writer", formatted notebook). Entries come out in discovery order, not sorted.
+    Tables are yielded while the rows are scanned; notebooks follow once their jobs have
+    been pre-loaded in one batch. Invalid or unsuccessful query output yields nothing.
     """
-    print("Processing lineage results with optimization...")
-    start_time = time.time()
-    
-    processed_data: Dict[str, Any] = {
-        "upstream_tables": [],
-        "downstream_tables": [],
-        "notebooks_reading": [],
-        "notebooks_writing": []
-    }
-    
     if not lineage_query_output or lineage_query_output.get("status") != "success" or not isinstance(lineage_query_output.get("data"), list):
-        print("Warning: Lineage query output is invalid or not successful. Returning empty lineage.")
-        return processed_data
+        logger.warning("Lineage query output is invalid or not successful. Returning empty lineage.")
+        return
 
     upstream_set = set()
     downstream_set = set()
-    notebooks_reading_dict = {}
-    notebooks_writing_dict = {}
     
-    # Collect all unique job IDs first for batch processing
+    # Collect all unique job IDs first for batch processing.
+    # The same (notebook_id, job_id) pair recurs across many lineage events, so pairs are
+    # deduplicated, keeping [reads main table, writes main table] flags OR'd across events.
     unique_job_ids = set()
-    notebook_job_pairs = []
+    notebook_job_pairs: Dict[tuple, List[bool]] = {}
     
-    for row in lineage_query_output["data"]:
-        source_table = row.get("source_table_full_name")
-        target_table = row.get("target_table_full_name")
-        entity_metadata = row.get("entity_metadata")
-        
+    # Local references keep attribute and global lookups out of the per-row loop.
+    # Table names are interned so the repeated comparisons against the main table
+    # usually succeed on the identity check instead of comparing characters.
+    intern = sys.intern
+    main_table = intern(main_table_full_name)
+    upstream_add = upstream_set.add
+    downstream_add = downstream_set.add
+    job_id_add = unique_job_ids.add
+    get_pair_flags = notebook_job_pairs.get
+    json_loads = _json.loads
+    get_row_fields = operator.attrgetter("source_table_full_name", "target_table_full_name", "entity_metadata")
+
+    for source_table, target_table, entity_metadata in map(get_row_fields, lineage_query_output["data"]):
+        if source_table:
+            source_table = intern(source_table)
+        if target_table:
+            target_table = intern(target_table)
+
         # Parse entity metadata
         notebook_id = None
         job_id = None
@@ -184,7 +708,7 @@ def _process_lineage_results(lineage_query_output: Dict[str, Any], main_table_fu
         if entity_metadata:
             try:
                 if isinstance(entity_metadata, str):
-                    metadata_dict = json.loads(entity_metadata)
+                    metadata_dict = json_loads(entity_metadata)
                 else:
                     metadata_dict = entity_metadata
                     
@@ -196,143 +720,460 @@ def _process_lineage_results(lineage_query_output: Dict[str, Any], main_table_fu
                 pass
         
         # Process table-to-table lineage
-        if source_table == main_table_full_name and target_table and target_table != main_table_full_name:
-            downstream_set.add(target_table)
-        elif target_table == main_table_full_name and source_table and source_table != main_table_full_name:
-            upstream_set.add(source_table)
+        if source_table == main_table and target_table and target_table != main_table:
+            if target_table not in downstream_set:
+                downstream_add(target_table)
+                yield ("downstream", target_table)
+        elif target_table == main_table and source_table and source_table != main_table:
+            if source_table not in upstream_set:
+                upstream_add(source_table)
+                yield ("upstream", source_table)
         
         # Collect notebook-job pairs for batch processing
         if notebook_id and job_id:
-            unique_job_ids.add(job_id)
-            notebook_job_pairs.append({
-                'notebook_id': notebook_id,
-                'job_id': job_id,
-                'source_table': source_table,
-                'target_table': target_table
-            })
+            is_reading = source_table == main_table
+            is_writing = not is_reading and target_table == main_table
+            if not (is_reading or is_writing):
+                continue
+            pair_key = (notebook_id, job_id)
+            pair_flags = get_pair_flags(pair_key)
+            if pair_flags is None:
+                job_id_add(job_id)
+                notebook_job_pairs[pair_key] = [is_reading, is_writing]
+            else:
+                pair_flags[0] |= is_reading
+                pair_flags[1] |= is_writing
     
-    # Pre-load all job information in parallel (this is where the optimization happens)
-    print(f"Pre-loading {len(unique_job_ids)} unique jobs...")
+    # Pre-load all job and notebook information in parallel (this is where the optimization happens)
+    logger.debug("Pre-loading %d unique jobs...", len(unique_job_ids))
     batch_start = time.time()
     
-    for job_id in unique_job_ids:
-        _get_job_info_cached(job_id)  # This will cache the job info
+    _prefetch_lineage_metadata(unique_job_ids)
     
     batch_time = time.time() - batch_start
-    print(f"Job batch loading took {batch_time:.2f} seconds")
+    logger.info("Job batch loading took %.2f seconds", batch_time)
     
-    # Now process all notebook-job pairs using cached data
-    print(f"Processing {len(notebook_job_pairs)} notebook entries...")
-    for pair in notebook_job_pairs:
-        notebook_info = _resolve_notebook_info_optimized(pair['notebook_id'], pair['job_id'])
+    # Now process all notebook-job pairs using cached data.
+    # A notebook run by several jobs is listed once per section, with the last job seen.
+    notebooks_reading_dict = {}
+    notebooks_writing_dict = {}
+    logger.debug("Processing %d notebook entries...", len(notebook_job_pairs))
+    for (notebook_id, job_id), (is_reading, is_writing) in notebook_job_pairs.items():
+        notebook_info = _resolve_notebook_info_optimized(notebook_id, job_id)
         formatted_info = _format_notebook_info_optimized(notebook_info)
         
-        if pair['source_table'] == main_table_full_name:
-            notebooks_reading_dict[pair['notebook_id']] = formatted_info
-        elif pair['target_table'] == main_table_full_name:
-            notebooks_writing_dict[pair['notebook_id']] = formatted_info
+        if is_reading:
+            notebooks_reading_dict[notebook_id] = formatted_info
+        if is_writing:
+            notebooks_writing_dict[notebook_id] = formatted_info
+
+    for formatted_info in notebooks_reading_dict.values():
+        yield ("reader", formatted_info)
+    for formatted_info in notebooks_writing_dict.values():
+        yield ("writer", formatted_info)
+
+# Section of the processed lineage dict that each iter_lineage_entries kind is collected into
+_LINEAGE_ENTRY_SECTIONS = {
+    "upstream": "upstream_tables",
+    "downstream": "downstream_tables",
+    "reader": "notebooks_reading",
+    "writer": "notebooks_writing",
+}
+
+# Shared read-only result for tables without lineage, which are common in bulk lookups
+_EMPTY_LINEAGE: Mapping[str, Any] = MappingProxyType({section: () for section in _LINEAGE_ENTRY_SECTIONS.values()})
+
+def _process_lineage_results(lineage_query_output: Dict[str, Any], main_table_full_name: str) -> Mapping[str, Any]:
+    """
+    Collects iter_lineage_entries into the processed lineage dict of sorted per-section lists.
+    This dict is what the lineage caches hold and what _format_lineage_md renders.
+    Output without rows returns the shared, read-only _EMPTY_LINEAGE; callers must not mutate results.
+    """
+    if not lineage_query_output or lineage_query_output.get("status") != "success" or not isinstance(lineage_query_output.get("data"), list):
+        logger.warning("Lineage query output is invalid or not successful. Returning empty lineage.")
+        return _EMPTY_LINEAGE
+    if not lineage_query_output["data"]:
+        return _EMPTY_LINEAGE
+
+    logger.debug("Processing lineage results with optimization...")
+    start_time = time.time()
     
-    processed_data["upstream_tables"] = sorted(list(upstream_set))
-    processed_data["downstream_tables"] = sorted(list(downstream_set))
-    processed_data["notebooks_reading"] = sorted(list(notebooks_reading_dict.values()))
-    processed_data["notebooks_writing"] = sorted(list(notebooks_writing_dict.values()))
+    processed_data: Dict[str, Any] = {section: [] for section in _LINEAGE_ENTRY_SECTIONS.values()}
+    for kind, value in iter_lineage_entries(lineage_query_output, main_table_full_name):
+        processed_data[_LINEAGE_ENTRY_SECTIONS[kind]].append(value)
+    for values in processed_data.values():
+        values.sort()
     
     total_time = time.time() - start_time
-    print(f"Total lineage processing took {total_time:.2f} seconds")
+    logger.info("Total lineage processing took %.2f seconds", total_time)
     
     return processed_data
 
 def clear_lineage_cache():
     """Clear the job and notebook caches to free memory"""
-    global _job_cache, _notebook_cache
-    _job_cache = {}
-    _notebook_cache = {}
-    print("Cleared lineage caches")
+    _job_cache.clear()
+    _notebook_cache.clear()
+    _get_table_lineage.cache_clear()
+    logger.info("Cleared lineage caches")
+
+def invalidate_job(job_id: str):
+    """Evict one job from the job cache, e.g. after the job's tasks were edited"""
+    _job_cache.pop(job_id)
+
+def invalidate_notebook(notebook_path: str):
+    """Evict one notebook path from the notebook ID cache, e.g. after it was moved or recreated"""
+    _notebook_cache.pop(notebook_path)
+
+# Number of most recent lineage events considered per table
+_LINEAGE_ROWS_PER_TABLE = 100
 
+# The table name is bound as a parameter, so the statement text is identical for every table
+_TABLE_LINEAGE_SQL = f"""
+    SELECT source_table_full_name, target_table_full_name, entity_type, entity_id, 
+           entity_run_id, entity_metadata, created_by, event_time
+    FROM system.access.table_lineage
+    WHERE source_table_full_name = :table_name OR target_table_full_name = :table_name
+    ORDER BY event_time DESC LIMIT {_LINEAGE_ROWS_PER_TABLE};
+    """
+
+# Multi-table variant; {markers} is a list of parameter markers, one per table.
+# Each row is tagged with the requested table it belongs to (a row linking two requested tables
+# appears once for each), and the limit is applied per table, so a busy table cannot crowd out
+# the events of a quieter one. The second branch skips self-references already matched by the first.
+_TABLES_LINEAGE_SQL = f"""
+    SELECT lineage_table, source_table_full_name, target_table_full_name, entity_type, entity_id,
+           entity_run_id, entity_metadata, created_by, event_time
+    FROM (
+        SELECT source_table_full_name AS lineage_table, *
+        FROM system.access.table_lineage
+        WHERE source_table_full_name IN ({{markers}})
+        UNION ALL
+        SELECT target_table_full_name AS lineage_table, *
+        FROM system.access.table_lineage
+        WHERE target_table_full_name IN ({{markers}})
+          AND NOT (source_table_full_name <=> target_table_full_name)
+    )
+    QUALIFY ROW_NUMBER() OVER (PARTITION BY lineage_table ORDER BY event_time DESC) <= {_LINEAGE_ROWS_PER_TABLE}
+    ORDER BY lineage_table, event_time DESC;
+    """
+
+_LINEAGE_WAREHOUSE_MISSING = {"status": "error", "error": "DATABRICKS_SQL_WAREHOUSE_ID is not set. Cannot fetch lineage."}
+
+def _lineage_from_query_output(raw_lineage_output: Dict[str, Any], table_full_name: str) -> Mapping[str, Any]:
+    """Processes lineage query output for one table, surfacing a failed query's status and error."""
+    if raw_lineage_output.get("status") != "success":
+        logger.warning("Lineage query for %s did not succeed: %s", table_full_name, raw_lineage_output.get("error"))
+        # Surface the failure to the caller; failed lookups are not cached
+        return {**_EMPTY_LINEAGE, "status": raw_lineage_output.get("status", "error"), "error": raw_lineage_output.get("error")}
+    return _process_lineage_results(raw_lineage_output, table_full_name)
+
+@ttl_cache(seconds=LINEAGE_CACHE_TTL_SECONDS, cache_if=lambda lineage: lineage.get("status", "success") == "success")
 def _get_table_lineage(table_full_name: str) -> Dict[str, Any]:
     """
     Retrieves table lineage information for a given table using the global SDK client
     and global SQL warehouse ID. Now includes notebook and job information with enhanced details.
     """
     if not DATABRICKS_SQL_WAREHOUSE_ID: # Check before attempting query
-        return {"status": "error", "error": "DATABRICKS_SQL_WAREHOUSE_ID is not set. Cannot fetch lineage."}
+        return dict(_LINEAGE_WAREHOUSE_MISSING)
 
-    lineage_sql_query = f"""
-    SELECT source_table_full_name, target_table_full_name, entity_type, entity_id, 
-           entity_run_id, entity_metadata, created_by, event_time
-    FROM system.access.table_lineage
-    WHERE source_table_full_name = '{table_full_name}' OR target_table_full_name = '{table_full_name}'
-    ORDER BY event_time DESC LIMIT 100;
-    """
-    print(f"Fetching and processing lineage for table: {table_full_name}")
+    logger.info("Fetching and processing lineage for table: %s", table_full_name)
     # execute_databricks_sql will now use the global warehouse_id
-    raw_lineage_output = execute_databricks_sql(lineage_sql_query, wait_timeout='50s') 
-    return _process_lineage_results(raw_lineage_output, table_full_name)
+    raw_lineage_output = execute_databricks_sql(
+        _TABLE_LINEAGE_SQL,
+        wait_timeout='50s',
+        parameters=[StatementParameterListItem(name="table_name", value=table_full_name, type="STRING")],
+        as_namedtuples=True,
+        use_cache=False
+    )
+    return _lineage_from_query_output(raw_lineage_output, table_full_name)
+
+def _get_tables_lineage_bulk(table_full_names: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Retrieves lineage for several tables with a single warehouse round-trip.
+    The query returns each table's most recent events, tagged with the table, so every
+    bucket holds the same rows as a single-table lookup and is processed the same way.
+    """
+    if not DATABRICKS_SQL_WAREHOUSE_ID:
+        return {name: dict(_LINEAGE_WAREHOUSE_MISSING) for name in table_full_names}
+
+    logger.info("Fetching and processing lineage for %d tables in one query", len(table_full_names))
+    lineage_sql_query = _TABLES_LINEAGE_SQL.format(
+        markers=", ".join(f":table_{i}" for i in range(len(table_full_names)))
+    )
+    raw_lineage_output = execute_databricks_sql(
+        lineage_sql_query,
+        wait_timeout='50s',
+        parameters=[
+            StatementParameterListItem(name=f"table_{i}", value=name, type="STRING")
+            for i, name in enumerate(table_full_names)
+        ],
+        as_namedtuples=True,
+        use_cache=False
+    )
+    if raw_lineage_output.get("status") != "success":
+        return {name: _lineage_from_query_output(raw_lineage_output, name) for name in table_full_names}
+
+    rows_by_table: Dict[str, List[Any]] = {name: [] for name in table_full_names}
+    for row in raw_lineage_output["data"]:
+        table_rows = rows_by_table.get(row.lineage_table)
+        if table_rows is not None:
+            table_rows.append(row)
+
+    return {
+        name: _lineage_from_query_output({**raw_lineage_output, "data": table_rows}, name)
+        for name, table_rows in rows_by_table.items()
+    }
+
+def _get_tables_lineage_batch(table_full_names: List[str], tables_per_query: int = 50) -> Dict[str, Dict[str, Any]]:
+    """
+    Retrieves lineage for many tables. Tables are grouped into multi-table queries of at most
+    `tables_per_query` tables, and those queries run concurrently on the shared lineage executor,
+    whose small size keeps them within the warehouse's concurrency limit.
+    """
+    if not table_full_names:
+        return {}
+    table_groups = [table_full_names[i:i + tables_per_query] for i in range(0, len(table_full_names), tables_per_query)]
+    lineage_by_table: Dict[str, Dict[str, Any]] = {}
+    for group_lineage in _LINEAGE_EXECUTOR.map(_get_tables_lineage_bulk, table_groups):
+        lineage_by_table.update(group_lineage)
+    return lineage_by_table
+
+# Markdown header prefixes for a heading level and the level below it, e.g. {1: ("#", "##")}
+_HEADER_PREFIXES = {level: ("#" * level, "#" * (level + 1)) for level in range(1, 6)}
 
-def _format_single_table_md(table_info: TableInfo, base_heading_level: int, display_columns: bool) -> List[str]:
+def _format_single_table_md(table_info: TableInfo, base_heading_level: int, display_columns: bool, buf: io.StringIO) -> None:
     """
-    Formats the details for a single TableInfo object into a list of Markdown strings.
+    Writes the details for a single TableInfo object into buf as Markdown.
     Uses a base_heading_level to control Markdown header depth for hierarchical display.
+    The table header is written first without a leading newline; callers separate it from earlier content.
     """
-    table_markdown_parts = []
-    table_header_prefix = "#" * base_heading_level
-    sub_header_prefix = "#" * (base_heading_level + 1)
+    table_header_prefix, sub_header_prefix = _HEADER_PREFIXES[base_heading_level]
+    write = buf.write
 
-    table_markdown_parts.append(f"{table_header_prefix} Table: **{table_info.full_name}**")
+    write(f"{table_header_prefix} Table: **{table_info.full_name}**")
 
     if table_info.comment:
-        table_markdown_parts.extend(["", f"**Description**: {table_info.comment}"])
+        write(f"\n\n**Description**: {table_info.comment}")
     elif base_heading_level == 1:
-        table_markdown_parts.extend(["", "**Description**: No description provided."])
+        write("\n\n**Description**: No description provided.")
     
-    # Process and add partition columns
-    partition_column_names: List[str] = []
-    if table_info.columns:
-        temp_partition_cols: List[tuple[str, int]] = []
-        for col in table_info.columns:
-            if col.partition_index is not None:
-                temp_partition_cols.append((col.name, col.partition_index))
-        if temp_partition_cols:
-            temp_partition_cols.sort(key=lambda x: x[1])
-            partition_column_names = [name for name, index in temp_partition_cols]
-
-    if partition_column_names:
-        table_markdown_parts.extend(["", f"{sub_header_prefix} Partition Columns"])
-        table_markdown_parts.extend([f"- `{col_name}`" for col_name in partition_column_names])
+    # Single pass over the SDK column objects; both sections below work off these tuples
+    column_rows = _extract_column_rows(table_info.columns)
+
+    # Process and add partition columns, ordered by partition index
+    partition_rows = sorted((row for row in column_rows if row[4] is not None), key=operator.itemgetter(4))
+
+    if partition_rows:
+        write(f"\n\n{sub_header_prefix} Partition Columns")
+        for row in partition_rows:
+            write(f"\n- `{row[0]}`")
     elif base_heading_level == 1:
-        table_markdown_parts.extend(["", f"{sub_header_prefix} Partition Columns", "- *This table is not partitioned or partition key information is unavailable.*"])
+        write(f"""
+
+{sub_header_prefix} Partition Columns
+- *This table is not partitioned or partition key information is unavailable.*""")
 
     if display_columns:
-        table_markdown_parts.extend(["", f"{sub_header_prefix} Table Columns"])
-        if table_info.columns:
-            table_markdown_parts.extend(_format_column_details_md(table_info.columns))
+        write(f"\n\n{sub_header_prefix} Table Columns")
+        # _format_column_details_md renders its own placeholder when there are no columns
+        _format_column_details_md(column_rows, buf)
+
+def _format_lineage_md(lineage_info: Dict[str, Any], base_heading_level: int, buf: io.StringIO) -> None:
+    """
+    Writes processed lineage information into buf as Markdown lines, each preceded by a newline.
+    base_heading_level is the level of the enclosing "Lineage Information" header;
+    each lineage section is rendered one level below it.
+    """
+    write = buf.write
+    section_prefix = _HEADER_PREFIXES[base_heading_level][1]
+
+    has_upstream = lineage_info and isinstance(lineage_info.get("upstream_tables"), list) and lineage_info["upstream_tables"]
+    has_downstream = lineage_info and isinstance(lineage_info.get("downstream_tables"), list) and lineage_info["downstream_tables"]
+    has_notebooks_reading = lineage_info and isinstance(lineage_info.get("notebooks_reading"), list) and lineage_info["notebooks_reading"]
+    has_notebooks_writing = lineage_info and isinstance(lineage_info.get("notebooks_writing"), list) and lineage_info["notebooks_writing"]
+
+    if has_upstream:
+        write(f"\n\n{section_prefix} Upstream Tables (tables this table reads from):")
+        for table in lineage_info["upstream_tables"]:
+            write(f"\n- `{table}`")
+    
+    if has_downstream:
+        write(f"\n\n{section_prefix} Downstream Tables (tables that read from this table):")
+        for table in lineage_info["downstream_tables"]:
+            write(f"\n- `{table}`")
+    
+    if has_notebooks_reading:
+        write(f"\n\n{section_prefix} Notebooks Reading from this Table:")
+        for notebook in lineage_info["notebooks_reading"]:
+            write(f"\n- {notebook}\n")
+    
+    if has_notebooks_writing:
+        write(f"\n\n{section_prefix} Notebooks Writing to this Table:")
+        for notebook in lineage_info["notebooks_writing"]:
+            write(f"\n- {notebook}\n")
+    
+    if not any([has_upstream, has_downstream, has_notebooks_reading, has_notebooks_writing]):
+        if lineage_info and lineage_info.get("status") == "error" and lineage_info.get("error"):
+             write(f"\n\n*Note: Could not retrieve complete lineage information.*\n> *Lineage fetch error: {lineage_info.get('error')}*")
+        elif lineage_info and lineage_info.get("status") != "success" and lineage_info.get("error"):
+            write(f"\n\n*Note: Could not retrieve complete lineage information.*\n> *Lineage fetch error: {lineage_info.get('error')}*")
         else:
-            table_markdown_parts.append("  - *No column information available.*")
-            
-    return table_markdown_parts
+            write("\n- *No table, notebook, or job dependencies found or lineage fetch was not fully successful.*")
+
+def _rows_as_dicts(query_result: Dict[str, Any]) -> Dict[str, Any]:
+    """Returns a copy of a successful columnar query result whose rows are dicts keyed by column name."""
+    column_names = query_result["columns"]
+    return {**query_result, "data": [dict(zip(column_names, row)) for row in query_result["data"]]}
+
+@functools.lru_cache(maxsize=64)
+def _row_class(column_names: tuple) -> type:
+    """namedtuple class for a result's columns, shared by every result with the same columns"""
+    # rename=True swaps column names that are not valid identifiers for positional field names
+    return collections.namedtuple("Row", column_names, rename=True)
 
-def execute_databricks_sql(sql_query: str, wait_timeout: str = '50s') -> Dict[str, Any]:
+def _rows_as_namedtuples(query_result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Returns a copy of a successful columnar query result whose rows are namedtuples with
+    one field per column. These are cheaper to build and smaller than per-row dicts.
+    """
+    make_row = _row_class(tuple(query_result["columns"]))._make
+    return {**query_result, "data": [make_row(row) for row in query_result["data"]]}
+
+def _shape_query_rows(query_result: Dict[str, Any], as_dicts: bool, as_namedtuples: bool) -> Dict[str, Any]:
+    if as_namedtuples:
+        return _rows_as_namedtuples(query_result)
+    if as_dicts:
+        return _rows_as_dicts(query_result)
+    return query_result
+
+def _query_cache_key(sql_query: str, parameters: Optional[List[StatementParameterListItem]], row_limit: Optional[int] = None) -> Optional[tuple]:
+    """Returns the result cache key for a read-only statement, or None when it must not be cached"""
+    if QUERY_CACHE_TTL_SECONDS <= 0:
+        return None
+    normalized_sql = _normalize_sql(sql_query)
+    if not _is_read_only_sql(normalized_sql):
+        return None
+    parameter_values = tuple((p.name, p.type, p.value) for p in parameters or ())
+    return (normalized_sql, parameter_values, DATABRICKS_SQL_WAREHOUSE_ID, row_limit)
+
+def _successful_query_result(column_names: List[str], data: Optional[List[List[Any]]], cache_key: Optional[tuple], truncated: bool = False, byte_count: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Builds the columnar result of a succeeded statement and caches it under cache_key.
+    `truncated` marks results cut off by the statement's row_limit; `byte_count` is the
+    result size reported in the statement's manifest, if any.
+    """
+    if data:
+        # data_array is already a list of rows in column order; it is kept as-is rather than copied into dicts
+        query_result = {"status": "success", "columns": column_names, "row_count": len(data), "data": data}
+    else:
+        query_result = {"status": "success", "columns": column_names, "row_count": 0, "data": [], "message": "Query succeeded but returned no data."}
+    if truncated:
+        query_result["truncated"] = True
+    # Only successful results are cached; failures and errors are always retried
+    if cache_key is not None and query_result["row_count"] <= _QUERY_CACHE_MAX_ROWS and (byte_count or 0) <= _QUERY_CACHE_MAX_BYTES:
+        _query_cache.setdefault(cache_key, query_result)
+    return query_result
+
+# Rows returned by the execute_sql_query tool are capped on the warehouse via the statement's row_limit,
+# so a query without a LIMIT never ships and buffers millions of rows only for them to be rendered as text.
+# Set DATABRICKS_SQL_ROW_LIMIT to 0 to return every row.
+SQL_RESULT_ROW_LIMIT = int(os.environ.get("DATABRICKS_SQL_ROW_LIMIT", "10000"))
+
+def _sql_log_excerpt(sql_query: str) -> str:
+    return f"{sql_query[:200]}...{' (truncated)' if len(sql_query) > 200 else ''}"
+
+# Statements still running after the server-side wait are polled with exponential backoff
+# (0.25s, 0.5s, 1s, ... capped at 30s) until they finish or the absolute deadline passes
+_STATEMENT_POLL_INITIAL_DELAY_SECONDS = 0.25
+_STATEMENT_POLL_MAX_DELAY_SECONDS = 30.0
+_STATEMENT_POLL_DEADLINE_SECONDS = 600
+_STATEMENT_PENDING_STATES = (StatementState.PENDING, StatementState.RUNNING)
+# The same states as they appear in Statement Execution API JSON
+_STATEMENT_PENDING_STATE_NAMES = frozenset(state.value for state in _STATEMENT_PENDING_STATES)
+
+_SQL_WAREHOUSE_MISSING = {"status": "error", "error": "DATABRICKS_SQL_WAREHOUSE_ID is not set. Cannot execute SQL query."}
+
+def _wait_for_statement(response: StatementResponse) -> StatementResponse:
+    """
+    Polls a statement that outlived its wait_timeout until it leaves the PENDING/RUNNING states.
+    A statement still running at the deadline is cancelled and its last response returned.
+    """
+    deadline = time.monotonic() + _STATEMENT_POLL_DEADLINE_SECONDS
+    retry_count = 0
+    while response.status and response.status.state in _STATEMENT_PENDING_STATES:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            logger.warning("Statement %s still %s after %d seconds; cancelling", response.statement_id, response.status.state.value, _STATEMENT_POLL_DEADLINE_SECONDS)
+            try:
+                sdk_client.statement_execution.cancel_execution(response.statement_id)
+            except Exception as e:
+                logger.error("Error cancelling statement %s: %s", response.statement_id, e)
+            break
+        time.sleep(min(_STATEMENT_POLL_MAX_DELAY_SECONDS, _STATEMENT_POLL_INITIAL_DELAY_SECONDS * 2 ** retry_count, remaining))
+        retry_count += 1
+        response = sdk_client.statement_execution.get_statement(response.statement_id)
+    return response
+
+def _statement_rows(response: StatementResponse) -> Optional[List[List[Any]]]:
+    """
+    Returns every row of a succeeded statement. The warehouse splits large results into chunks
+    and inlines only the first; the others are fetched in order and appended to it.
+    """
+    if not response.result:
+        return None
+    data = response.result.data_array
+    next_chunk_index = response.result.next_chunk_index
+    if next_chunk_index is not None:
+        data = list(data or ())
+    while next_chunk_index is not None:
+        chunk = sdk_client.statement_execution.get_statement_result_chunk_n(response.statement_id, next_chunk_index)
+        data.extend(chunk.data_array or ())
+        next_chunk_index = chunk.next_chunk_index
+    return data
+
+def execute_databricks_sql(sql_query: str, wait_timeout: str = '50s', parameters: Optional[List[StatementParameterListItem]] = None, as_dicts: bool = False, as_namedtuples: bool = False, row_limit: Optional[int] = None, use_cache: bool = True) -> Dict[str, Any]:
     """
     Executes a SQL query on Databricks using the global SDK client and global SQL warehouse ID.
+    Values for named parameter markers (e.g. `:table_name`) are passed via `parameters`.
+    With `row_limit` set, the warehouse returns at most that many rows and `truncated` is set when rows were dropped.
+
+    Successful results are columnar: `columns` holds the column names and `data` the rows as
+    lists of values in column order. Pass `as_dicts=True` to get each row as a dict instead,
+    or `as_namedtuples=True` for namedtuples whose fields are the column names.
+    Read-only results are served from and stored in the SQL result cache unless `use_cache` is False.
     """
     if not DATABRICKS_SQL_WAREHOUSE_ID:
-        return {"status": "error", "error": "DATABRICKS_SQL_WAREHOUSE_ID is not set. Cannot execute SQL query."}
+        return dict(_SQL_WAREHOUSE_MISSING)
     
+    cache_key = _query_cache_key(sql_query, parameters, row_limit) if use_cache else None
+    if cache_key is not None:
+        cached_result = _get_cached_query_result(cache_key)
+        if cached_result is not None:
+            logger.debug("Serving cached result for SQL:\n%s", _sql_log_excerpt(sql_query))
+            return _shape_query_rows(cached_result, as_dicts, as_namedtuples)
+
     try:
-        print(f"Executing SQL on warehouse {DATABRICKS_SQL_WAREHOUSE_ID} (timeout: {wait_timeout}):\n{sql_query[:200]}..." + (" (truncated)" if len(sql_query) > 200 else ""))
+        logger.info("Executing SQL on warehouse %s (timeout: %s):\n%s", DATABRICKS_SQL_WAREHOUSE_ID, wait_timeout, _sql_log_excerpt(sql_query))
         response: StatementResponse = sdk_client.statement_execution.execute_statement(
             statement=sql_query,
             warehouse_id=DATABRICKS_SQL_WAREHOUSE_ID, # Use global warehouse ID
-            wait_timeout=wait_timeout
+            wait_timeout=wait_timeout,
+            on_wait_timeout=ExecuteStatementRequestOnWaitTimeout.CONTINUE,
+            parameters=parameters,
+            row_limit=row_limit
         )
+        # Fast statements complete within the server-side wait; only long-running ones are polled
+        if response.status and response.status.state in _STATEMENT_PENDING_STATES:
+            response = _wait_for_statement(response)
 
         if response.status and response.status.state == StatementState.SUCCEEDED:
-            if response.result and response.result.data_array:
-                column_names = [col.name for col in response.manifest.schema.columns] if response.manifest and response.manifest.schema and response.manifest.schema.columns else []
-                results = [dict(zip(column_names, row)) for row in response.result.data_array]
-                return {"status": "success", "row_count": len(results), "data": results}
-            else:
-                return {"status": "success", "row_count": 0, "data": [], "message": "Query succeeded but returned no data."}
+            # Interned names make the per-row dict keys built by as_dicts share one string object
+            column_names = [sys.intern(col.name) for col in response.manifest.schema.columns] if response.manifest and response.manifest.schema and response.manifest.schema.columns else []
+            truncated = bool(response.manifest and response.manifest.truncated)
+            if cache_key is None:
+                _invalidate_query_cache_after(sql_query)
+            query_result = _successful_query_result(column_names, _statement_rows(response), cache_key, truncated, response.manifest.total_byte_count if response.manifest else None)
+            return _shape_query_rows(query_result, as_dicts, as_namedtuples)
         elif response.status:
             error_message = response.status.error.message if response.status.error else "No error details provided."
             return {"status": "failed", "error": f"Query execution failed with state: {response.status.state.value}", "details": error_message}
@@ -340,25 +1181,288 @@ def execute_databricks_sql(sql_query: str, wait_timeout: str = '50s') -> Dict[st
             return {"status": "failed", "error": "Query execution status unknown."}
     except KeyboardInterrupt:
         # Handle keyboard interrupt gracefully
-        print("SQL execution interrupted by user")
+        logger.warning("SQL execution interrupted by user")
         return {"status": "error", "error": "Query execution was interrupted by user."}
     except Exception as e:
         error_msg = str(e)
         # Check for common connection errors that might need reconnection
         if "Connection" in error_msg or "timed out" in error_msg:
-            print(f"Connection error detected: {error_msg}")
+            logger.error("Connection error detected: %s", error_msg)
             return {"status": "error", "error": f"Connection error during SQL execution: {error_msg}. You may need to restart the MCP server."}
         return {"status": "error", "error": f"An error occurred during SQL execution: {error_msg}"}
 
-def get_uc_table_details(full_table_name: str, include_lineage: bool = False) -> str:
+def execute_and_format(sql_query: str, wait_timeout: str = '50s') -> str:
+    """
+    Executes a SQL query and renders its result, or the reason it failed, as a readable string.
+    This is the preferred entry point when only text output is needed: rows go straight from the
+    statement's data_array into the formatter's buffer without an intermediate per-row structure.
+    Use execute_databricks_sql for programmatic access to the rows.
+    """
+    return _format_execution_result(execute_databricks_sql(sql_query, wait_timeout=wait_timeout))
+
+def _format_execution_result(sdk_result: Dict[str, Any]) -> str:
+    """Renders an execute_databricks_sql result, or the reason it failed, as a readable string"""
+    status = sdk_result.get("status")
+    if status == "failed":
+        error_message = sdk_result.get("error", "Unknown query execution error.")
+        details = sdk_result.get("details", "No additional details provided.")
+        return f"SQL Query Failed: {error_message}\nDetails: {details}"
+    elif status == "error":
+        error_message = sdk_result.get("error", "Unknown error during SQL execution.")
+        details = sdk_result.get("details", "No additional details provided.")
+        return f"Error during SQL Execution: {error_message}\nDetails: {details}"
+    elif status == "success":
+        formatted = format_query_results(sdk_result)
+        if sdk_result.get("truncated"):
+            formatted += f"\n\n*Only the first {sdk_result['row_count']} rows are shown. Add a LIMIT or a filter to narrow the result.*"
+        return formatted
+    else:
+        # Should not happen if execute_databricks_sql always returns a known status
+        return f"Received an unexpected status from query execution: {status}. Result: {sdk_result}"
+
+# Statement Execution REST API, used directly by the async execution path so that queries
+# run on the event loop instead of occupying a worker thread while they wait on the warehouse
+_STATEMENTS_API_PATH = "/api/2.0/sql/statements"
+_DATABRICKS_BASE_URL = DATABRICKS_HOST if DATABRICKS_HOST.startswith(("http://", "https://")) else f"https://{DATABRICKS_HOST}"
+# Async queries share one client, so with HTTP/2 their requests are multiplexed over a few connections.
+# At most _STATEMENT_MAX_CONCURRENCY statements run at once; further queries wait for a free slot.
+_STATEMENT_MAX_CONCURRENCY = int(os.environ.get("DATABRICKS_HTTP_POOL_MAX_SIZE", "16"))
+_statement_slots = asyncio.Semaphore(_STATEMENT_MAX_CONCURRENCY)
+_async_http_client: Optional[httpx.AsyncClient] = None
+
+# Idle connections outlive the longest poll interval, so polling a slow statement reuses its TLS connection
+_ASYNC_HTTP_LIMITS = httpx.Limits(
+    max_connections=_STATEMENT_MAX_CONCURRENCY,
+    max_keepalive_connections=_STATEMENT_MAX_CONCURRENCY,
+    keepalive_expiry=_STATEMENT_POLL_MAX_DELAY_SECONDS + 5
+)
+
+def _new_async_http_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        base_url=_DATABRICKS_BASE_URL,
+        headers={"Authorization": f"Bearer {DATABRICKS_TOKEN}"},
+        timeout=30.0,
+        limits=_ASYNC_HTTP_LIMITS,
+        http2=_HTTP2_AVAILABLE
+    )
+
+def _get_async_http_client() -> httpx.AsyncClient:
+    """Returns the shared client, creating it on first use inside the running event loop"""
+    global _async_http_client
+    if _async_http_client is None:
+        _async_http_client = _new_async_http_client()
+    return _async_http_client
+
+async def close_async_http_client():
+    """Closes the shared client; the next async query opens a new one"""
+    global _async_http_client
+    if _async_http_client is not None:
+        client, _async_http_client = _async_http_client, None
+        await client.aclose()
+
+# Like the SDK, requests answered with 429 (rate limited) or 503 (unavailable) are retried with
+# exponential backoff (1s, 2s, 4s, ... capped at 30s); a Retry-After header in seconds takes precedence
+_HTTP_RETRY_STATUS_CODES = frozenset({429, 503})
+_HTTP_MAX_RETRIES = 6
+_HTTP_RETRY_INITIAL_DELAY_SECONDS = 1.0
+
+def _retry_after_seconds(response: httpx.Response) -> Optional[float]:
+    try:
+        return max(0.0, float(response.headers["Retry-After"]))
+    except (KeyError, ValueError):
+        return None
+
+async def _request_with_retry(client: httpx.AsyncClient, method: str, url: str, **kwargs) -> httpx.Response:
+    """Sends a Statement Execution API request, retrying 429 and 503 responses, and raises for any other error status"""
+    for attempt in range(_HTTP_MAX_RETRIES + 1):
+        response = await client.request(method, url, **kwargs)
+        if response.status_code not in _HTTP_RETRY_STATUS_CODES or attempt == _HTTP_MAX_RETRIES:
+            break
+        delay = _retry_after_seconds(response)
+        if delay is None:
+            delay = _HTTP_RETRY_INITIAL_DELAY_SECONDS * 2 ** attempt
+        delay = min(delay, _STATEMENT_POLL_MAX_DELAY_SECONDS)
+        logger.warning("%s %s returned %d; retrying in %.1f seconds", method, url, response.status_code, delay)
+        await asyncio.sleep(delay)
+    response.raise_for_status()
+    return response
+
+async def _cancel_statement_async(client: httpx.AsyncClient, statement_id: str) -> None:
+    try:
+        await client.post(f"{_STATEMENTS_API_PATH}/{statement_id}/cancel")
+    except httpx.HTTPError as e:
+        logger.error("Error cancelling statement %s: %s", statement_id, e)
+
+async def _wait_for_statement_async(client: httpx.AsyncClient, statement: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Async counterpart of _wait_for_statement, working on Statement Execution API JSON.
+    The statement is also cancelled when polling fails or the awaiting task is cancelled,
+    so an abandoned query does not keep running on the warehouse.
+    """
+    deadline = time.monotonic() + _STATEMENT_POLL_DEADLINE_SECONDS
+    retry_count = 0
+    statement_id = statement.get("statement_id")
+    try:
+        while statement.get("status", {}).get("state") in _STATEMENT_PENDING_STATE_NAMES:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                logger.warning("Statement %s still %s after %d seconds; cancelling", statement_id, statement["status"]["state"], _STATEMENT_POLL_DEADLINE_SECONDS)
+                await _cancel_statement_async(client, statement_id)
+                break
+            await asyncio.sleep(min(_STATEMENT_POLL_MAX_DELAY_SECONDS, _STATEMENT_POLL_INITIAL_DELAY_SECONDS * 2 ** retry_count, remaining))
+            retry_count += 1
+            response = await _request_with_retry(client, "GET", f"{_STATEMENTS_API_PATH}/{statement_id}")
+            statement = response.json()
+    except (Exception, asyncio.CancelledError):
+        logger.warning("Polling statement %s stopped; cancelling it", statement_id)
+        await _cancel_statement_async(client, statement_id)
+        raise
+    return statement
+
+async def _statement_rows_async(client: httpx.AsyncClient, statement: Dict[str, Any]) -> Optional[List[List[Any]]]:
+    """Async counterpart of _statement_rows, fetching the chunks after the first over REST"""
+    result = statement.get("result") or {}
+    data = result.get("data_array")
+    next_chunk_index = result.get("next_chunk_index")
+    if next_chunk_index is not None:
+        data = list(data or ())
+    while next_chunk_index is not None:
+        response = await _request_with_retry(client, "GET", f"{_STATEMENTS_API_PATH}/{statement['statement_id']}/result/chunks/{next_chunk_index}")
+        chunk = response.json()
+        data.extend(chunk.get("data_array") or ())
+        next_chunk_index = chunk.get("next_chunk_index")
+    return data
+
+async def execute_databricks_sql_async(sql_query: str, wait_timeout: str = '50s', parameters: Optional[List[StatementParameterListItem]] = None, row_limit: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Async version of execute_databricks_sql that calls the Statement Execution REST API with httpx.
+    It returns the same columnar result or error dicts and shares the SQL result cache.
+    """
+    if not DATABRICKS_SQL_WAREHOUSE_ID:
+        return dict(_SQL_WAREHOUSE_MISSING)
+
+    cache_key = _query_cache_key(sql_query, parameters, row_limit)
+    if cache_key is not None:
+        cached_result = _get_cached_query_result(cache_key)
+        if cached_result is not None:
+            logger.debug("Serving cached result for SQL:\n%s", _sql_log_excerpt(sql_query))
+            return cached_result
+
+    request_body: Dict[str, Any] = {
+        "statement": sql_query,
+        "warehouse_id": DATABRICKS_SQL_WAREHOUSE_ID,
+        "wait_timeout": wait_timeout,
+        "on_wait_timeout": "CONTINUE",
+    }
+    if parameters:
+        request_body["parameters"] = [parameter.as_dict() for parameter in parameters]
+    if row_limit:
+        request_body["row_limit"] = row_limit
+
+    try:
+        logger.info("Executing SQL on warehouse %s (timeout: %s):\n%s", DATABRICKS_SQL_WAREHOUSE_ID, wait_timeout, _sql_log_excerpt(sql_query))
+        async with _statement_slots:
+            client = _get_async_http_client()
+            response = await _request_with_retry(client, "POST", _STATEMENTS_API_PATH, json=request_body)
+            statement = await _wait_for_statement_async(client, response.json())
+            status = statement.get("status")
+            succeeded = bool(status) and status.get("state") == "SUCCEEDED"
+            data = await _statement_rows_async(client, statement) if succeeded else None
+
+        if succeeded:
+            manifest = statement.get("manifest") or {}
+            columns = (manifest.get("schema") or {}).get("columns") or []
+            column_names = [sys.intern(col["name"]) for col in columns]
+            if cache_key is None:
+                _invalidate_query_cache_after(sql_query)
+            return _successful_query_result(column_names, data, cache_key, bool(manifest.get("truncated")), manifest.get("total_byte_count"))
+        elif status:
+            error_message = (status.get("error") or {}).get("message") or "No error details provided."
+            return {"status": "failed", "error": f"Query execution failed with state: {status.get('state')}", "details": error_message}
+        else:
+            return {"status": "failed", "error": "Query execution status unknown."}
+    except httpx.HTTPStatusError as e:
+        return {"status": "error", "error": f"An error occurred during SQL execution: {e}", "details": e.response.text}
+    except httpx.TransportError as e:
+        logger.error("Connection error detected: %s", e)
+        return {"status": "error", "error": f"Connection error during SQL execution: {e}. You may need to restart the MCP server."}
+    except Exception as e:
+        return {"status": "error", "error": f"An error occurred during SQL execution: {e}"}
+
+async def execute_and_format_async(sql_query: str, wait_timeout: str = '50s') -> str:
+    """
+    Async version of execute_and_format, running the statement without a worker thread.
+    At most SQL_RESULT_ROW_LIMIT rows are fetched and rendered.
+    """
+    result = await execute_databricks_sql_async(sql_query, wait_timeout=wait_timeout, row_limit=SQL_RESULT_ROW_LIMIT or None)
+    return _format_execution_result(result)
+
+async def execute_and_format_batch_async(sql_queries: List[str], max_concurrency: int = 10) -> str:
+    """
+    Runs several SQL queries concurrently and renders each result under a `## Query N` header, in input order.
+    At most `max_concurrency` statements run at once, further capped by the shared limit on concurrent statements.
+    A failing query is reported in its own block and does not affect the others.
+    """
+    if not sql_queries:
+        return "No SQL queries were provided."
+
+    slots = asyncio.Semaphore(max(1, min(max_concurrency, _STATEMENT_MAX_CONCURRENCY)))
+
+    async def run(sql_query: str) -> str:
+        async with slots:
+            return await execute_and_format_async(sql_query)
+
+    results = await asyncio.gather(*(run(sql_query) for sql_query in sql_queries), return_exceptions=True)
+
+    buf = io.StringIO()
+    write = buf.write
+    for i, (sql_query, result) in enumerate(zip(sql_queries, results), start=1):
+        if i > 1:
+            write("\n\n")
+        write(f"## Query {i}\n```sql\n{sql_query.strip()}\n```\n")
+        if isinstance(result, BaseException):
+            write(f"Error during SQL Execution: {result}")
+        else:
+            write(result)
+    return buf.getvalue()
+
+_tool_call_slots = asyncio.BoundedSemaphore(_TOOL_CALL_WORKERS)
+
+async def run_sdk_call(func, /, **kwargs):
+    """
+    Runs a blocking, SDK-backed function on the tool executor and awaits its result.
+    Calls beyond the executor's size wait on the event loop rather than in the executor's queue,
+    so a call cancelled while waiting never starts its SDK requests.
+    """
+    async with _tool_call_slots:
+        return await asyncio.get_running_loop().run_in_executor(_TOOL_EXECUTOR, functools.partial(func, **kwargs))
+
+# Rendered Markdown of the describe functions is cached briefly, so repeated tool calls with the
+# same arguments skip rendering and SDK lookups entirely. Output that includes lineage is kept for
+# at most LINEAGE_CACHE_TTL_SECONDS, like the lineage lookups it renders.
+# Set DATABRICKS_RESPONSE_CACHE_TTL to 0 to disable; it defaults to 0 when metadata caching is off.
+RESPONSE_CACHE_TTL_SECONDS = int(os.environ.get("DATABRICKS_RESPONSE_CACHE_TTL", str(min(60, METADATA_CACHE_TTL_SECONDS))))
+
+def _is_cacheable_response(markdown: str) -> bool:
+    """Error reports, including failed lineage lookups, are never cached so the next call retries"""
+    return not markdown.startswith("# Error") and "Lineage fetch error" not in markdown
+
+def _render_uc_table_details(full_table_name: str, include_lineage: bool) -> str:
     """
     Fetches table metadata and optionally lineage, then formats it into a Markdown string.
     Uses the _format_single_table_md helper for core table structure.
     """
-    print(f"Fetching metadata for {full_table_name}...")
+    lineage_future = None
+    if include_lineage and DATABRICKS_SQL_WAREHOUSE_ID:
+        logger.info("Fetching lineage for %s...", full_table_name)
+        # Lineage does not depend on the table metadata, so it is fetched on a worker thread
+        # while tables.get runs here
+        lineage_future = _LINEAGE_EXECUTOR.submit(_get_table_lineage, full_table_name)
+
+    logger.info("Fetching metadata for %s...", full_table_name)
     
     try:
-        table_info: TableInfo = sdk_client.tables.get(full_name=full_table_name)
+        table_info: TableInfo = _cached_table_get(full_table_name)
     except Exception as e:
         error_details = str(e)
         return f"""# Error: Could Not Retrieve Table Details
@@ -369,93 +1473,111 @@ def get_uc_table_details(full_table_name: str, include_lineage: bool = False) ->
 {error_details}
 ```"""
 
-    markdown_parts = _format_single_table_md(table_info, base_heading_level=1, display_columns=True)
+    buf = io.StringIO()
+    write = buf.write
+    _format_single_table_md(table_info, base_heading_level=1, display_columns=True, buf=buf)
 
     if include_lineage:
-        markdown_parts.extend(["", "## Lineage Information"])
+        write("\n\n## Lineage Information")
         if not DATABRICKS_SQL_WAREHOUSE_ID:
-            markdown_parts.append("- *Lineage fetching skipped: `DATABRICKS_SQL_WAREHOUSE_ID` environment variable is not set.*")
+            write("\n- *Lineage fetching skipped: `DATABRICKS_SQL_WAREHOUSE_ID` environment variable is not set.*")
         else:
-            print(f"Fetching lineage for {full_table_name}...")
-            lineage_info = _get_table_lineage(full_table_name)
-            
-            has_upstream = lineage_info and isinstance(lineage_info.get("upstream_tables"), list) and lineage_info["upstream_tables"]
-            has_downstream = lineage_info and isinstance(lineage_info.get("downstream_tables"), list) and lineage_info["downstream_tables"]
-            has_notebooks_reading = lineage_info and isinstance(lineage_info.get("notebooks_reading"), list) and lineage_info["notebooks_reading"]
-            has_notebooks_writing = lineage_info and isinstance(lineage_info.get("notebooks_writing"), list) and lineage_info["notebooks_writing"]
-
-            if has_upstream:
-                markdown_parts.extend(["", "### Upstream Tables (tables this table reads from):"])
-                markdown_parts.extend([f"- `{table}`" for table in lineage_info["upstream_tables"]])
-            
-            if has_downstream:
-                markdown_parts.extend(["", "### Downstream Tables (tables that read from this table):"])
-                markdown_parts.extend([f"- `{table}`" for table in lineage_info["downstream_tables"]])
-            
-            if has_notebooks_reading:
-                markdown_parts.extend(["", "### Notebooks Reading from this Table:"])
-                for notebook in lineage_info["notebooks_reading"]:
-                    markdown_parts.extend([f"- {notebook}", ""])
-            
-            if has_notebooks_writing:
-                markdown_parts.extend(["", "### Notebooks Writing to this Table:"])
-                for notebook in lineage_info["notebooks_writing"]:
-                    markdown_parts.extend([f"- {notebook}", ""])
+            lineage_info = lineage_future.result()
             
-            if not any([has_upstream, has_downstream, has_notebooks_reading, has_notebooks_writing]):
-                if lineage_info and lineage_info.get("status") == "error" and lineage_info.get("error"):
-                     markdown_parts.extend(["", "*Note: Could not retrieve complete lineage information.*", f"> *Lineage fetch error: {lineage_info.get('error')}*"])
-                elif lineage_info and lineage_info.get("status") != "success" and lineage_info.get("error"):
-                    markdown_parts.extend(["", "*Note: Could not retrieve complete lineage information.*", f"> *Lineage fetch error: {lineage_info.get('error')}*"])
-                else:
-                    markdown_parts.append("- *No table, notebook, or job dependencies found or lineage fetch was not fully successful.*")
+            _format_lineage_md(lineage_info, base_heading_level=2, buf=buf)
     else:
-        markdown_parts.extend(["", "## Lineage Information", "- *Lineage fetching skipped as per request.*"])
+        write("\n\n## Lineage Information\n- *Lineage fetching skipped as per request.*")
+
+    return buf.getvalue()
 
-    return "\n".join(markdown_parts)
+@ttl_cache(seconds=RESPONSE_CACHE_TTL_SECONDS, maxsize=128, cache_if=_is_cacheable_response)
+def _cached_table_details(full_table_name: str) -> str:
+    return _render_uc_table_details(full_table_name, include_lineage=False)
 
-def get_uc_schema_details(catalog_name: str, schema_name: str, include_columns: bool = False) -> str:
+@ttl_cache(seconds=min(RESPONSE_CACHE_TTL_SECONDS, LINEAGE_CACHE_TTL_SECONDS), maxsize=128, cache_if=_is_cacheable_response)
+def _cached_table_details_with_lineage(full_table_name: str) -> str:
+    return _render_uc_table_details(full_table_name, include_lineage=True)
+
+def get_uc_table_details(full_table_name: str, include_lineage: bool = False) -> str:
     """
-    Fetches detailed information for a specific schema, optionally including its tables and their columns.
+    Fetches table metadata and optionally lineage, then formats it into a Markdown string.
+    Recently rendered results are served from a short-lived cache.
+    """
+    if include_lineage:
+        return _cached_table_details_with_lineage(full_table_name)
+    return _cached_table_details(full_table_name)
+
+def _render_uc_schema_details(catalog_name: str, schema_name: str, include_columns: bool, max_tables: int, include_lineage: bool) -> str:
+    """
+    Fetches detailed information for a specific schema, optionally including its tables' columns and lineage.
     Uses the global SDK client and the _format_single_table_md helper with appropriate heading levels.
+    At most `max_tables` tables are fetched and listed; their lineage is fetched in bulk up front.
     """
     full_schema_name = f"{catalog_name}.{schema_name}"
-    markdown_parts = [f"# Schema Details: **{full_schema_name}**"]
+    buf = io.StringIO()
+    write = buf.write
+    write(f"# Schema Details: **{full_schema_name}**")
 
     try:
-        print(f"Fetching details for schema: {full_schema_name}...")
-        schema_info: SchemaInfo = sdk_client.schemas.get(full_name=full_schema_name)
+        logger.info("Fetching details for schema: %s...", full_schema_name)
+        schema_info: SchemaInfo = _cached_schema_get(full_schema_name)
 
         description = schema_info.comment if schema_info.comment else "No description provided."
-        markdown_parts.append(f"**Description**: {description}")
-        markdown_parts.append("")
+        write(f"\n**Description**: {description}\n")
 
-        markdown_parts.append(f"## Tables in Schema `{schema_name}`")
+        write(f"\n## Tables in Schema `{schema_name}`")
             
-        tables_iterable = sdk_client.tables.list(catalog_name=catalog_name, schema_name=schema_name)
-        tables_list = list(tables_iterable)
+        # Fetch one extra table to detect whether the listing was truncated
+        tables_listing = _list_metadata(_iter_tables, _cached_tables_list, catalog_name, schema_name, max_tables + 1)
 
-        if not tables_list:
-            markdown_parts.append("- *No tables found in this schema.*")
-        else:
-            for i, table_info in enumerate(tables_list):
-                if not isinstance(table_info, TableInfo):
-                    print(f"Warning: Encountered an unexpected item in tables list: {type(table_info)}")
-                    continue
-                
-                markdown_parts.extend(_format_single_table_md(
-                    table_info, 
-                    base_heading_level=3,
-                    display_columns=include_columns
-                ))
-                if i < len(tables_list) - 1:
-                    markdown_parts.append("\n=============\n")
+        lineage_by_table: Dict[str, Dict[str, Any]] = {}
+        if include_lineage and DATABRICKS_SQL_WAREHOUSE_ID:
+            # Bulk lineage needs every table name up front, so the listing is materialized here
+            tables_listing = list(tables_listing)
+            lineage_by_table = _get_tables_lineage_batch(
+                [table_info.full_name for table_info in tables_listing[:max_tables] if isinstance(table_info, TableInfo)]
+            )
+
+        tables_truncated = False
+        tables_shown = 0
+        for i, table_info in enumerate(tables_listing):
+            if i == max_tables:
+                tables_truncated = True
+                break
+            if not isinstance(table_info, TableInfo):
+                if logger.isEnabledFor(logging.WARNING):
+                    logger.warning(f"Encountered an unexpected item in tables list: {type(table_info)}")
+                continue
+
+            if tables_shown:
+                write("\n\n=============\n")
+            tables_shown += 1
+
+            # Tables are written straight into the schema's buffer as they are listed
+            write("\n")
+            _format_single_table_md(
+                table_info, 
+                base_heading_level=3,
+                display_columns=include_columns,
+                buf=buf
+            )
+            if include_lineage:
+                write("\n\n#### Lineage Information")
+                if not DATABRICKS_SQL_WAREHOUSE_ID:
+                    write("\n- *Lineage fetching skipped: `DATABRICKS_SQL_WAREHOUSE_ID` environment variable is not set.*")
                 else:
-                    markdown_parts.append("")
+                    _format_lineage_md(lineage_by_table.get(table_info.full_name), base_heading_level=4, buf=buf)
+
+        if not tables_shown:
+            write("\n- *No tables found in this schema.*")
+        else:
+            write("\n")
+            if tables_truncated:
+                write(f"\n*Only the first {max_tables} tables in `{full_schema_name}` are shown.*")
 
     except Exception as e:
         error_message = f"Failed to retrieve details for schema '{full_schema_name}': {str(e)}"
-        print(f"Error in get_uc_schema_details: {error_message}")
+        logger.error("Error in get_uc_schema_details: %s", error_message)
         return f"""# Error: Could Not Retrieve Schema Details
 **Schema:** `{full_schema_name}`
 **Problem:** An error occurred while attempting to fetch schema information.
@@ -464,49 +1586,75 @@ def get_uc_schema_details(catalog_name: str, schema_name: str, include_columns:
 {error_message}
 ```"""
 
-    return "\n".join(markdown_parts)
+    return buf.getvalue()
+
+@ttl_cache(seconds=RESPONSE_CACHE_TTL_SECONDS, maxsize=128, cache_if=_is_cacheable_response)
+def _cached_schema_details(catalog_name: str, schema_name: str, include_columns: bool, max_tables: int) -> str:
+    return _render_uc_schema_details(catalog_name, schema_name, include_columns, max_tables, include_lineage=False)
 
-def get_uc_catalog_details(catalog_name: str) -> str:
+@ttl_cache(seconds=min(RESPONSE_CACHE_TTL_SECONDS, LINEAGE_CACHE_TTL_SECONDS), maxsize=128, cache_if=_is_cacheable_response)
+def _cached_schema_details_with_lineage(catalog_name: str, schema_name: str, include_columns: bool, max_tables: int) -> str:
+    return _render_uc_schema_details(catalog_name, schema_name, include_columns, max_tables, include_lineage=True)
+
+def get_uc_schema_details(catalog_name: str, schema_name: str, include_columns: bool = False, max_tables: int = 200, include_lineage: bool = False) -> str:
     """
-    Fetches and formats a summary of all schemas within a given catalog
-    using the global SDK client.
+    Fetches a schema's tables, optionally with their columns and lineage, formatted as Markdown.
+    Recently rendered results are served from a short-lived cache.
     """
-    markdown_parts = [f"# Catalog Summary: **{catalog_name}**", ""]
+    if include_lineage:
+        return _cached_schema_details_with_lineage(catalog_name, schema_name, bool(include_columns), max_tables)
+    return _cached_schema_details(catalog_name, schema_name, bool(include_columns), max_tables)
+
+@ttl_cache(seconds=RESPONSE_CACHE_TTL_SECONDS, cache_if=_is_cacheable_response)
+def get_uc_catalog_details(catalog_name: str, max_schemas: int = 200) -> str:
+    """
+    Fetches and formats a summary of the schemas within a given catalog
+    using the global SDK client. At most `max_schemas` schemas are fetched and listed.
+    """
+    buf = io.StringIO()
+    write = buf.write
+    write(f"# Catalog Summary: **{catalog_name}**\n")
     schemas_found_count = 0
     
     try:
-        print(f"Fetching schemas for catalog: {catalog_name} using global sdk_client...")
-        # The sdk_client is globally defined in this module
-        schemas_iterable = sdk_client.schemas.list(catalog_name=catalog_name)
-        
-        # Convert iterator to list to easily check if empty and get a count
-        schemas_list = list(schemas_iterable) 
+        logger.info("Fetching schemas for catalog: %s using global sdk_client...", catalog_name)
+        # One extra schema is fetched to detect whether the listing was truncated.
+        schemas_listing = _list_metadata(_iter_schemas, _cached_schemas_list, catalog_name, max_schemas + 1)
 
-        if not schemas_list:
-            markdown_parts.append(f"No schemas found in catalog `{catalog_name}`.")
-            return "\n".join(markdown_parts)
-
-        schemas_found_count = len(schemas_list)
-        markdown_parts.append(f"Showing top {schemas_found_count} schemas found in catalog `{catalog_name}`:")
-        markdown_parts.append("")
-
-        for i, schema_info in enumerate(schemas_list):
+        # Schemas are rendered into their own buffer as they are listed; the count header
+        # that precedes them is only known once the listing has been consumed.
+        schemas_buf = io.StringIO()
+        write_schema = schemas_buf.write
+        schemas_truncated = False
+        for i, schema_info in enumerate(schemas_listing):
+            if i == max_schemas:
+                schemas_truncated = True
+                break
+            schemas_found_count += 1
             if not isinstance(schema_info, SchemaInfo):
-                print(f"Warning: Encountered an unexpected item in schemas list: {type(schema_info)}")
+                if logger.isEnabledFor(logging.WARNING):
+                    logger.warning(f"Encountered an unexpected item in schemas list: {type(schema_info)}")
                 continue
 
             # Start of a schema item in the list
             schema_name_display = schema_info.full_name if schema_info.full_name else "Unnamed Schema"
-            markdown_parts.append(f"## {schema_name_display}") # Main bullet point for schema name
+            write_schema(f"\n## {schema_name_display}") # Main bullet point for schema name
                         
             description = f"**Description**: {schema_info.comment}" if schema_info.comment else ""
-            markdown_parts.append(description)
+            write_schema(f"\n{description}")
             
-            markdown_parts.append("") # Add a blank line for separation between schemas, or remove if too much space
+            write_schema("\n") # Add a blank line for separation between schemas, or remove if too much space
+
+        if not schemas_found_count:
+            write(f"\nNo schemas found in catalog `{catalog_name}`.")
+            return buf.getvalue()
+
+        write(f"\nShowing top {schemas_found_count} schemas found in catalog `{catalog_name}`:\n")
+        write(schemas_buf.getvalue())
 
     except Exception as e:
         error_message = f"Failed to retrieve schemas for catalog '{catalog_name}': {str(e)}"
-        print(f"Error in get_catalog_summary: {error_message}")
+        logger.error("Error in get_catalog_summary: %s", error_message)
         # Return a structured error message in Markdown
         return f"""# Error: Could Not Retrieve Catalog Summary
 **Catalog:** `{catalog_name}`
@@ -516,53 +1664,63 @@ def get_uc_catalog_details(catalog_name: str) -> str:
 {error_message}
 ```"""
     
-    markdown_parts.append(f"**Total Schemas Found in `{catalog_name}`**: {schemas_found_count}")
-    return "\n".join(markdown_parts)
+    if schemas_truncated:
+        write(f"\n*Only the first {max_schemas} schemas in `{catalog_name}` are shown.*")
+        write(f"\n**Total Schemas Shown from `{catalog_name}`**: {schemas_found_count}")
+    else:
+        write(f"\n**Total Schemas Found in `{catalog_name}`**: {schemas_found_count}")
+    return buf.getvalue()
 
 
 
-def get_uc_all_catalogs_summary() -> str:
+@ttl_cache(seconds=RESPONSE_CACHE_TTL_SECONDS, cache_if=_is_cacheable_response)
+def _render_all_catalogs_summary() -> str:
     """
     Fetches a summary of all available Unity Catalogs, including their names, comments, and types.
     Uses the global SDK client.
     """
-    markdown_parts = ["# Available Unity Catalogs", ""]
+    buf = io.StringIO()
+    write = buf.write
+    write("# Available Unity Catalogs\n")
     catalogs_found_count = 0
 
     try:
-        print("Fetching all catalogs using global sdk_client...")
-        catalogs_iterable = sdk_client.catalogs.list()
-        catalogs_list = list(catalogs_iterable)
-
-        if not catalogs_list:
-            markdown_parts.append("- *No catalogs found or accessible.*")
-            return "\n".join(markdown_parts)
-
-        catalogs_found_count = len(catalogs_list)
-        markdown_parts.append(f"Found {catalogs_found_count} catalog(s):")
-        markdown_parts.append("")
+        logger.info("Fetching all catalogs using global sdk_client...")
+        catalogs_listing = _list_metadata(_iter_catalogs, _cached_catalogs_list)
 
-        for catalog_info in catalogs_list:
+        # Catalogs are rendered into their own buffer as they are listed, since the count comes first
+        catalogs_buf = io.StringIO()
+        write_catalog = catalogs_buf.write
+        for catalog_info in catalogs_listing:
+            catalogs_found_count += 1
             if not isinstance(catalog_info, CatalogInfo):
-                print(f"Warning: Encountered an unexpected item in catalogs list: {type(catalog_info)}")
+                if logger.isEnabledFor(logging.WARNING):
+                    logger.warning(f"Encountered an unexpected item in catalogs list: {type(catalog_info)}")
                 continue
             
-            markdown_parts.append(f"- **`{catalog_info.name}`**")
+            write_catalog(f"\n- **`{catalog_info.name}`**")
             description = catalog_info.comment if catalog_info.comment else "No description provided."
-            markdown_parts.append(f"  - **Description**: {description}")
+            write_catalog(f"\n  - **Description**: {description}")
             
             catalog_type_str = "N/A"
             if catalog_info.catalog_type and hasattr(catalog_info.catalog_type, 'value'):
                 catalog_type_str = catalog_info.catalog_type.value
             elif catalog_info.catalog_type: # Fallback if it's not an Enum but has a direct string representation
                 catalog_type_str = str(catalog_info.catalog_type)
-            markdown_parts.append(f"  - **Type**: `{catalog_type_str}`")
+            write_catalog(f"\n  - **Type**: `{catalog_type_str}`")
             
-            markdown_parts.append("") # Add a blank line for separation
+            write_catalog("\n") # Add a blank line for separation
+
+        if not catalogs_found_count:
+            write("\n- *No catalogs found or accessible.*")
+            return buf.getvalue()
+
+        write(f"\nFound {catalogs_found_count} catalog(s):\n")
+        write(catalogs_buf.getvalue())
 
     except Exception as e:
         error_message = f"Failed to retrieve catalog list: {str(e)}"
-        print(f"Error in get_uc_all_catalogs_summary: {error_message}")
+        logger.error("Error in _render_all_catalogs_summary: %s", error_message)
         return f"""# Error: Could Not Retrieve Catalog List
 **Problem:** An error occurred while attempting to fetch the list of catalogs.
 **Details:**
@@ -570,5 +1728,51 @@ def get_uc_all_catalogs_summary() -> str:
 {error_message}
 ```"""
     
-    return "\n".join(markdown_parts)
+    return buf.getvalue()
+
+# The catalog summary is the usual first call of a session, so the server keeps a rendered snapshot
+# that a background task refreshes every CATALOG_SNAPSHOT_INTERVAL_SECONDS; list_uc_catalogs is then
+# served from memory, at the cost of missing catalogs created since the last refresh.
+# Set DATABRICKS_CATALOG_SNAPSHOT_INTERVAL to 0 to disable; it defaults to 0 when metadata caching is off.
+CATALOG_SNAPSHOT_INTERVAL_SECONDS = int(os.environ.get("DATABRICKS_CATALOG_SNAPSHOT_INTERVAL", "600" if METADATA_CACHE_TTL_SECONDS > 0 else "0"))
+_catalog_summary_snapshot: Optional[str] = None
+
+def refresh_catalog_summary_snapshot() -> None:
+    """Re-renders the catalog summary from a fresh listing; a failed listing keeps the previous snapshot"""
+    global _catalog_summary_snapshot
+    _cached_catalogs_list.cache_clear()
+    _render_all_catalogs_summary.cache_clear()
+    markdown = _render_all_catalogs_summary()
+    if _is_cacheable_response(markdown):
+        _catalog_summary_snapshot = markdown
+
+async def refresh_catalog_summary_periodically(interval_seconds: int = CATALOG_SNAPSHOT_INTERVAL_SECONDS):
+    """Keeps the catalog summary snapshot warm until cancelled, starting with an immediate refresh"""
+    while True:
+        try:
+            await run_sdk_call(refresh_catalog_summary_snapshot)
+        except Exception as e:
+            logger.error("Error refreshing catalog summary snapshot: %s", e)
+        await asyncio.sleep(interval_seconds)
+
+def get_uc_all_catalogs_summary() -> str:
+    """
+    Returns a Markdown summary of all available Unity Catalogs.
+    Served from the background snapshot when one exists, otherwise from the short-lived response cache.
+    """
+    snapshot = _catalog_summary_snapshot
+    if snapshot is not None:
+        return snapshot
+    return _render_all_catalogs_summary()
 
+def clear_metadata_caches():
+    """Clear the memoized Unity Catalog lookups and the cached describe output"""
+    global _catalog_summary_snapshot
+    for cached_func in (
+        _cached_table_get, _cached_tables_list, _cached_schema_get, _cached_schemas_list, _cached_catalogs_list,
+        _cached_table_details, _cached_table_details_with_lineage, _cached_schema_details, _cached_schema_details_with_lineage,
+        get_uc_catalog_details, _render_all_catalogs_summary,
+    ):
+        cached_func.cache_clear()
+    _catalog_summary_snapshot = None
+    logger.info("Cleared metadata caches")
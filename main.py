@@ -1,21 +1,103 @@
-from typing import Optional
+from typing import Dict, List, Optional
 import asyncio
+import contextlib
+import functools
+import inspect
+import logging
+import os
 import signal
 import sys
 from mcp.server.fastmcp import FastMCP
-from databricks_formatter import format_query_results
 from databricks_sdk_utils import (
     get_uc_table_details,
     get_uc_catalog_details,
     get_uc_schema_details,
-    execute_databricks_sql,
-    get_uc_all_catalogs_summary
+    execute_and_format_async,
+    execute_and_format_batch_async,
+    run_sdk_call,
+    close_async_http_client,
+    get_uc_all_catalogs_summary,
+    clear_metadata_caches,
+    clear_lineage_cache,
+    clear_query_cache,
+    refresh_catalog_summary_periodically,
+    CATALOG_SNAPSHOT_INTERVAL_SECONDS
 )
 
 
-mcp = FastMCP("databricks")
+@contextlib.asynccontextmanager
+async def server_lifespan(server: FastMCP):
+    """
+    Keeps the catalog summary snapshot refreshed while the server runs, and closes the
+    shared async HTTP clients used for SQL statements when it stops
+    """
+    snapshot_task = None
+    if CATALOG_SNAPSHOT_INTERVAL_SECONDS > 0:
+        snapshot_task = asyncio.create_task(refresh_catalog_summary_periodically(CATALOG_SNAPSHOT_INTERVAL_SECONDS))
+    try:
+        yield {}
+    finally:
+        if snapshot_task is not None:
+            snapshot_task.cancel()
+        await close_async_http_client()
+
+mcp = FastMCP("databricks", lifespan=server_lifespan)
+
+def tool_errors(cancelled_message: str, error_prefix: str):
+    """
+    Turns cancellation and unexpected exceptions raised by a tool into the text returned to the client.
+    Both messages are format strings over the tool's arguments, e.g. "... for '{catalog_name}'";
+    arguments are only bound when an error actually occurs.
+    """
+    def decorator(tool_func):
+        signature = inspect.signature(tool_func)
+
+        def render(message, args, kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            return message.format(**bound.arguments)
+
+        @functools.wraps(tool_func)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await tool_func(*args, **kwargs)
+            except asyncio.CancelledError:
+                return render(cancelled_message, args, kwargs)
+            except Exception as e:
+                return f"{render(error_prefix, args, kwargs)}: {str(e)}"
+        return wrapper
+    return decorator
+
+# Running calls of read-only tools, keyed by tool name and arguments
+_inflight_calls: Dict[tuple, asyncio.Task] = {}
+
+def single_flight(tool_func):
+    """
+    Makes concurrent calls of a read-only tool with identical arguments share one execution:
+    later callers await the running call instead of starting their own SDK requests.
+    The shared call is shielded, so one caller being cancelled does not cancel it for the others.
+    """
+    signature = inspect.signature(tool_func)
+
+    @functools.wraps(tool_func)
+    async def wrapper(*args, **kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        key = (tool_func.__name__, tuple(bound.arguments.items()))
+        task = _inflight_calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(tool_func(*args, **kwargs))
+            _inflight_calls[key] = task
+
+            def forget(finished_task):
+                if _inflight_calls.get(key) is finished_task:
+                    del _inflight_calls[key]
+            task.add_done_callback(forget)
+        return await asyncio.shield(task)
+    return wrapper
 
 @mcp.tool()
+@tool_errors("Query execution was cancelled by user.", "An unexpected error occurred while executing SQL query")
 async def execute_sql_query(sql: str) -> str:
     """
     Executes a given SQL query against the Databricks SQL warehouse and returns the formatted results.
@@ -27,33 +109,31 @@ async def execute_sql_query(sql: str) -> str:
     Args:
         sql: The complete SQL query string to execute.
     """
-    try:
-        # Run the SQL query in a separate thread to avoid blocking
-        sdk_result = await asyncio.to_thread(execute_databricks_sql, sql_query=sql)
-        
-        status = sdk_result.get("status")
-        if status == "failed":
-            error_message = sdk_result.get("error", "Unknown query execution error.")
-            details = sdk_result.get("details", "No additional details provided.")
-            return f"SQL Query Failed: {error_message}\nDetails: {details}"
-        elif status == "error":
-            error_message = sdk_result.get("error", "Unknown error during SQL execution.")
-            details = sdk_result.get("details", "No additional details provided.")
-            return f"Error during SQL Execution: {error_message}\nDetails: {details}"
-        elif status == "success":
-            return format_query_results(sdk_result)
-        else:
-            # Should not happen if execute_databricks_sql always returns a known status
-            return f"Received an unexpected status from query execution: {status}. Result: {sdk_result}"
-            
-    except asyncio.CancelledError:
-        # Handle cancellation gracefully
-        return "Query execution was cancelled by user."
-    except Exception as e:
-        return f"An unexpected error occurred while executing SQL query: {str(e)}"
+    # The statement is submitted and polled over async HTTP, so no worker thread is held while it runs
+    return await execute_and_format_async(sql_query=sql)
+
+
+@mcp.tool()
+@tool_errors("Batch query execution was cancelled by user.", "An unexpected error occurred while executing SQL queries")
+async def execute_sql_batch(sqls: List[str], max_concurrency: int = 10) -> str:
+    """
+    Executes several independent SQL queries concurrently and returns all of their formatted results.
 
+    Use this tool instead of repeated `execute_sql_query` calls when you already know a set of queries
+    you want to run, e.g. inspecting several tables at once. The queries run in parallel on the SQL warehouse,
+    so the total time is close to that of the slowest query rather than the sum of all of them.
+    Results are returned in the order of `sqls`, each under a `## Query N` header followed by the query text.
+    A failing query is reported in its own section and does not affect the others.
+
+    Args:
+        sqls: The complete SQL query strings to execute.
+        max_concurrency: Maximum number of queries running at the same time. Defaults to 10.
+    """
+    return await execute_and_format_batch_async(sqls, max_concurrency=max_concurrency)
 
 @mcp.tool()
+@tool_errors("Table description for '{full_table_name}' was cancelled by user.", "Error getting detailed table description for '{full_table_name}'")
+@single_flight
 async def describe_uc_table(full_table_name: str, include_lineage: Optional[bool] = False) -> str:
     """
     Provides a detailed description of a specific Unity Catalog table.
@@ -91,21 +171,15 @@ async def describe_uc_table(full_table_name: str, include_lineage: Optional[bool
                          Defaults to False. May take longer to retrieve but provides rich context for 
                          understanding data dependencies and enabling code exploration.
     """
-    try:
-        details_markdown = await asyncio.to_thread(
-            get_uc_table_details,
-            full_table_name=full_table_name,
-            include_lineage=include_lineage
-        )
-        return details_markdown
-    except asyncio.CancelledError:
-        return f"Table description for '{full_table_name}' was cancelled by user."
-    except ImportError as e:
-        return f"Error initializing Databricks SDK utilities: {str(e)}. Please ensure DATABRICKS_HOST and DATABRICKS_TOKEN are set."
-    except Exception as e:
-        return f"Error getting detailed table description for '{full_table_name}': {str(e)}"
+    return await run_sdk_call(
+        get_uc_table_details,
+        full_table_name=full_table_name,
+        include_lineage=include_lineage
+    )
 
 @mcp.tool()
+@tool_errors("Catalog description for '{catalog_name}' was cancelled by user.", "Error getting catalog summary for '{catalog_name}'")
+@single_flight
 async def describe_uc_catalog(catalog_name: str) -> str:
     """
     Provides a summary of a specific Unity Catalog, listing all its schemas with their names and descriptions.
@@ -117,21 +191,15 @@ async def describe_uc_catalog(catalog_name: str) -> str:
     Args:
         catalog_name: The name of the Unity Catalog to describe (e.g., `prod`, `dev`, `system`).
     """
-    try:
-        summary_markdown = await asyncio.to_thread(
-            get_uc_catalog_details,
-            catalog_name=catalog_name
-        )
-        return summary_markdown
-    except asyncio.CancelledError:
-        return f"Catalog description for '{catalog_name}' was cancelled by user."
-    except ImportError as e:
-        return f"Error initializing Databricks SDK utilities: {str(e)}. Please ensure DATABRICKS_HOST and DATABRICKS_TOKEN are set."
-    except Exception as e:
-        return f"Error getting catalog summary for '{catalog_name}': {str(e)}"
+    return await run_sdk_call(
+        get_uc_catalog_details,
+        catalog_name=catalog_name
+    )
 
 @mcp.tool()
-async def describe_uc_schema(catalog_name: str, schema_name: str, include_columns: Optional[bool] = False) -> str:
+@tool_errors("Schema description for '{catalog_name}.{schema_name}' was cancelled by user.", "Error getting detailed schema description for '{catalog_name}.{schema_name}'")
+@single_flight
+async def describe_uc_schema(catalog_name: str, schema_name: str, include_columns: Optional[bool] = False, include_lineage: Optional[bool] = False) -> str:
     """
     Provides detailed information about a specific schema within a Unity Catalog.
     
@@ -139,29 +207,28 @@ async def describe_uc_schema(catalog_name: str, schema_name: str, include_column
     Optionally, it can list all tables within the schema and their column details.
     Set `include_columns=True` to get column information, which is crucial for query construction but makes the output longer.
     If `include_columns=False`, only table names and descriptions are shown, useful for a quicker overview.
+    Set `include_lineage=True` to also get the upstream/downstream tables and notebooks of every table;
+    lineage for all tables is fetched in a few bulk queries.
     The output is formatted in Markdown.
 
     Args:
         catalog_name: The name of the catalog containing the schema.
         schema_name: The name of the schema to describe.
         include_columns: If True, lists tables with their columns. Defaults to False for a briefer summary.
+        include_lineage: If True, includes lineage for each table. Defaults to False. Requires a SQL warehouse
+                         and takes longer to retrieve.
     """
-    try:
-        details_markdown = await asyncio.to_thread(
-            get_uc_schema_details,
-            catalog_name=catalog_name,
-            schema_name=schema_name,
-            include_columns=include_columns
-        )
-        return details_markdown
-    except asyncio.CancelledError:
-        return f"Schema description for '{catalog_name}.{schema_name}' was cancelled by user."
-    except ImportError as e:
-        return f"Error initializing Databricks SDK utilities: {str(e)}. Please ensure DATABRICKS_HOST and DATABRICKS_TOKEN are set."
-    except Exception as e:
-        return f"Error getting detailed schema description for '{catalog_name}.{schema_name}': {str(e)}"
+    return await run_sdk_call(
+        get_uc_schema_details,
+        catalog_name=catalog_name,
+        schema_name=schema_name,
+        include_columns=include_columns,
+        include_lineage=include_lineage
+    )
 
 @mcp.tool()
+@tool_errors("Catalog listing was cancelled by user.", "Error listing catalogs")
+@single_flight
 async def list_uc_catalogs() -> str:
     """
     Lists all available Unity Catalogs with their names, descriptions, and types.
@@ -170,15 +237,27 @@ async def list_uc_catalogs() -> str:
     It provides a high-level overview of all accessible catalogs in the workspace.
     The output is formatted in Markdown.
     """
-    try:
-        summary_markdown = await asyncio.to_thread(get_uc_all_catalogs_summary)
-        return summary_markdown
-    except asyncio.CancelledError:
-        return "Catalog listing was cancelled by user."
-    except ImportError as e:
-        return f"Error initializing Databricks SDK utilities: {str(e)}. Please ensure DATABRICKS_HOST and DATABRICKS_TOKEN are set."
-    except Exception as e:
-        return f"Error listing catalogs: {str(e)}"
+    return await run_sdk_call(get_uc_all_catalogs_summary)
+
+def _clear_all_caches():
+    clear_metadata_caches()
+    clear_lineage_cache()
+    clear_query_cache()
+
+@mcp.tool()
+async def refresh_metadata_cache() -> str:
+    """
+    Clears all cached Unity Catalog metadata, lineage, and SQL query results.
+
+    Catalog, schema, and table descriptions are cached for a few minutes to keep repeated calls fast.
+    Use this tool after tables, schemas, or jobs were changed in the workspace so that the next
+    describe or query call fetches fresh information.
+    """
+    # Later calls must not join a running call that may still return pre-refresh data
+    _inflight_calls.clear()
+    # Clearing takes cache locks and deletes from the on-disk cache, so it runs off the event loop
+    await run_sdk_call(_clear_all_caches)
+    return "Cleared cached metadata, lineage, and query results. The next calls will fetch fresh data from Databricks."
 
 def handle_shutdown(signum, frame):
     """Handle graceful shutdown on interrupt signals"""
@@ -186,6 +265,26 @@ def handle_shutdown(signum, frame):
     sys.exit(0)
 
 if __name__ == "__main__":
+    # Logs go to stderr: stdout carries the MCP stdio protocol.
+    # force=True replaces the handler FastMCP installed on the root logger when `mcp` was created,
+    # which would otherwise make this call a no-op and LOG_LEVEL ineffective.
+    logging.basicConfig(
+        level=os.environ.get("LOG_LEVEL", "INFO").upper(),
+        stream=sys.stderr,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+        force=True
+    )
+    # httpx logs every request at INFO, which would mean one line per statement submit and poll
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    # uvloop lowers per-callback overhead of the event loop; it is used when installed (it does not support Windows)
+    if sys.platform != "win32":
+        try:
+            import uvloop
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        except ImportError:
+            pass
+
     # Register signal handlers for graceful shutdown
     signal.signal(signal.SIGINT, handle_shutdown)
     signal.signal(signal.SIGTERM, handle_shutdown)
@@ -0,0 +1,12 @@
+import os
+import sys
+
+# databricks_sdk_utils builds its SDK client at import time and requires these to be set;
+# no request is sent to the placeholder workspace by the tests.
+os.environ.setdefault("DATABRICKS_HOST", "https://example.cloud.databricks.com")
+os.environ.setdefault("DATABRICKS_TOKEN", "test-token")
+os.environ.setdefault("DATABRICKS_SQL_WAREHOUSE_ID", "test-warehouse")
+# Keep the persistent metadata cache out of the user's home directory
+os.environ["DATABRICKS_METADATA_CACHE_DIR"] = ""
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
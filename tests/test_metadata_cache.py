@@ -0,0 +1,95 @@
+import os
+import sqlite3
+
+from databricks_sdk_utils import _SqliteStore, _TTLCache, ttl_cache
+
+
+def _store(tmp_path, name="jobs", ttl=3600):
+    return _SqliteStore(os.path.join(tmp_path, "metadata.sqlite3"), name, ttl)
+
+
+def test_full_cache_drops_oldest_entry():
+    cache = _TTLCache(maxsize=2, ttl=60)
+    cache.setdefault("a", 1)
+    cache.setdefault("b", 2)
+    cache.setdefault("c", 3)
+    assert "a" not in cache
+    assert (cache.get("b"), cache.get("c")) == (2, 3)
+
+
+def test_expired_entries_are_dropped_before_fresh_ones():
+    cache = _TTLCache(maxsize=2, ttl=-1)
+    cache.setdefault("expired", 1)
+    cache.ttl = 60
+    cache.setdefault("a", 2)
+    cache.setdefault("b", 3)
+    assert cache.get("expired") is None
+    assert (cache.get("a"), cache.get("b")) == (2, 3)
+
+
+def test_setdefault_keeps_fresh_entry():
+    cache = _TTLCache(maxsize=2, ttl=60)
+    assert cache.setdefault("a", 1) == 1
+    assert cache.setdefault("a", 2) == 1
+
+
+def test_store_persists_only_matching_entries(tmp_path):
+    cache = _TTLCache(maxsize=8, ttl=60, store=_store(tmp_path), persist_if=lambda value: "error" not in value)
+    cache.setdefault("1", {"job_name": "nightly"})
+    cache.setdefault("2", {"error": "not found"})
+    assert _store(tmp_path).items() == [("1", {"job_name": "nightly"})]
+
+
+def test_cache_warms_from_store_once(tmp_path):
+    _TTLCache(maxsize=8, ttl=60, store=_store(tmp_path)).setdefault("1", "a")
+    store = _store(tmp_path)
+    warm_reads = []
+    read_items = store.items
+
+    def count_reads():
+        warm_reads.append(1)
+        return read_items()
+
+    store.items = count_reads
+    cache = _TTLCache(maxsize=8, ttl=60, store=store)
+    assert cache.get("1") == "a"
+    assert cache.get("2") is None
+    cache.setdefault("2", "b")
+    assert len(warm_reads) == 1
+
+
+def test_store_is_namespaced_by_cache_name(tmp_path):
+    _store(tmp_path, "jobs").set("1", "job")
+    assert _store(tmp_path, "notebooks").items() == []
+
+
+def test_warming_deletes_expired_rows(tmp_path):
+    _store(tmp_path, ttl=-1).set("old", "a")
+    _store(tmp_path).set("new", "b")
+    assert _store(tmp_path).items() == [("new", "b")]
+    with sqlite3.connect(os.path.join(tmp_path, "metadata.sqlite3")) as connection:
+        assert connection.execute("SELECT key FROM cache_entries").fetchall() == [("new",)]
+
+
+def test_clear_empties_memory_and_store(tmp_path):
+    cache = _TTLCache(maxsize=8, ttl=60, store=_store(tmp_path))
+    cache.setdefault("1", "a")
+    cache.clear()
+    assert len(cache) == 0
+    assert _store(tmp_path).items() == []
+
+
+def test_ttl_cache_ignores_results_of_calls_running_during_clear():
+    calls = []
+
+    @ttl_cache(seconds=60)
+    def describe(name):
+        calls.append(name)
+        if len(calls) == 1:
+            # The cache is cleared while this call is still fetching
+            describe.cache_clear()
+        return len(calls)
+
+    assert describe("t") == 1
+    assert describe("t") == 2
+    assert describe("t") == 2
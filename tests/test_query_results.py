@@ -0,0 +1,94 @@
+import pytest
+
+import databricks_sdk_utils
+from databricks_formatter import format_query_results
+from databricks_sdk_utils import _normalize_sql, _query_cache_key
+
+
+def test_format_columnar_result():
+    result = {"status": "success", "columns": ["id", "name"], "row_count": 2, "data": [["1", "a"], ["2", None]]}
+    assert format_query_results(result) == "id | name\n---------\n1 | a\n2 | NULL"
+
+
+def test_format_dict_rows_follow_column_order():
+    result = {"status": "success", "columns": ["id", "name"], "data": [{"name": "a", "id": "1"}]}
+    assert format_query_results(result) == "id | name\n---------\n1 | a"
+
+
+def test_format_dict_rows_without_column_names():
+    result = {"status": "success", "data": [{"id": 1}]}
+    assert format_query_results(result) == "id\n--\n1"
+
+
+def test_format_non_string_values():
+    result = {"status": "success", "columns": ["a", "b"], "data": [[1, None], [2.5, True]]}
+    assert format_query_results(result) == "a | b\n-----\n1 | NULL\n2.5 | True"
+
+
+def test_format_success_without_rows():
+    result = {"status": "success", "columns": ["id"], "row_count": 0, "data": []}
+    assert format_query_results(result) == "id\n--\nNo data rows found."
+    assert format_query_results({"status": "success", "columns": [], "data": []}) == "Query succeeded but returned no data."
+
+
+def test_format_dbapi_result():
+    result = {
+        "manifest": {"schema": {"columns": [{"name": "a"}, {"name": "b"}]}},
+        "result": {"data_array": [["1", None]]},
+    }
+    assert format_query_results(result) == "a | b\n-----\n1 | NULL"
+
+
+def test_format_dbapi_result_without_schema():
+    result = {"manifest": {}, "result": {"data_array": [["1"]]}}
+    assert format_query_results(result) == "No column names found in the result."
+
+
+def test_format_error_result():
+    result = {"status": "error", "error": "boom", "details": "trace"}
+    assert format_query_results(result) == "Error from query execution: boom Details: trace"
+    assert format_query_results({"status": "failed"}) == "Invalid or unrecognized result format."
+    assert format_query_results({}) == "No results or invalid result format."
+
+
+def test_normalize_collapses_case_whitespace_and_comments():
+    assert _normalize_sql("  SELECT  *\n\tFROM t -- trailing note\n/* block */ WHERE x = 1 ;") == "select * from t where x = 1"
+    assert _normalize_sql("select a -- c\n from t") == _normalize_sql("SELECT a FROM t")
+
+
+def test_normalize_keeps_literal_content():
+    assert _normalize_sql("SELECT 'Bob', \"MiXeD\", `Col` FROM T") == "select 'Bob', \"MiXeD\", `Col` from t"
+    assert _normalize_sql("SELECT '-- not a comment', '/* nor this */'") == "select '-- not a comment', '/* nor this */'"
+
+
+def test_normalize_apostrophe_in_comment_does_not_hide_literals():
+    upper = _normalize_sql("SELECT * FROM t -- don't cache me\nWHERE name = 'Bob'")
+    lower = _normalize_sql("SELECT * FROM t -- don't cache me\nWHERE name = 'bob'")
+    assert upper == "select * from t where name = 'Bob'"
+    assert upper != lower
+
+
+@pytest.mark.parametrize("sql_query", [
+    "SELECT 1",
+    "show tables in c.s",
+    "DESCRIBE TABLE c.s.t",
+    "WITH x AS (SELECT 1) SELECT * FROM x",
+    "with x (a, b) as (select 1, ')'), y as (select 2) select * from x, y",
+])
+def test_read_only_statements_are_cacheable(sql_query):
+    assert _query_cache_key(sql_query, None) is not None
+
+
+@pytest.mark.parametrize("sql_query", [
+    "INSERT INTO t VALUES (1)",
+    "WITH x AS (SELECT 1) INSERT INTO t SELECT * FROM x",
+    "WITH x AS (SELECT 1) MERGE INTO t USING x ON true WHEN MATCHED THEN DELETE",
+    "-- leading comment\nDELETE FROM t",
+])
+def test_writes_are_not_cacheable(sql_query):
+    assert _query_cache_key(sql_query, None) is None
+
+
+def test_query_cache_disabled_by_ttl(monkeypatch):
+    monkeypatch.setattr(databricks_sdk_utils, "QUERY_CACHE_TTL_SECONDS", 0)
+    assert _query_cache_key("SELECT 1", None) is None
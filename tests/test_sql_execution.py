@@ -0,0 +1,188 @@
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from databricks.sdk.service.sql import (
+    ColumnInfo,
+    ResultData,
+    ResultManifest,
+    ResultSchema,
+    StatementResponse,
+    StatementState,
+    StatementStatus,
+)
+
+import databricks_sdk_utils
+
+
+def _statement_response(columns, rows, next_chunk_index=None):
+    return StatementResponse(
+        statement_id="s1",
+        status=StatementStatus(state=StatementState.SUCCEEDED),
+        manifest=ResultManifest(schema=ResultSchema(columns=[ColumnInfo(name=c) for c in columns])),
+        result=ResultData(data_array=rows, next_chunk_index=next_chunk_index),
+    )
+
+
+class FakeStatementExecution:
+    """Answers statements from a list of callables, recording each executed statement"""
+
+    def __init__(self, *handlers, chunks=()):
+        self.handlers = list(handlers)
+        self.chunks = list(chunks)
+        self.statements = []
+
+    def execute_statement(self, statement, **kwargs):
+        self.statements.append(statement)
+        return self.handlers.pop(0)(statement, **kwargs)
+
+    def get_statement_result_chunk_n(self, statement_id, chunk_index):
+        return self.chunks[chunk_index - 1]
+
+
+@pytest.fixture
+def statement_execution(monkeypatch):
+    def install(*handlers, chunks=()):
+        fake = FakeStatementExecution(*handlers, chunks=chunks)
+        monkeypatch.setattr(databricks_sdk_utils, "sdk_client", SimpleNamespace(statement_execution=fake))
+        return fake
+
+    databricks_sdk_utils.clear_query_cache()
+    yield install
+    databricks_sdk_utils.clear_query_cache()
+
+
+def test_write_invalidates_cached_reads(statement_execution):
+    fake = statement_execution(
+        lambda statement, **kwargs: _statement_response(["id"], [["1"]]),
+        lambda statement, **kwargs: _statement_response(["num_affected_rows"], [["1"]]),
+        lambda statement, **kwargs: _statement_response(["id"], [["1"], ["2"]]),
+    )
+    assert databricks_sdk_utils.execute_databricks_sql("SELECT id FROM t")["data"] == [["1"]]
+    assert databricks_sdk_utils.execute_databricks_sql("SELECT id FROM t")["data"] == [["1"]]
+    databricks_sdk_utils.execute_databricks_sql("INSERT INTO t VALUES (2)")
+    assert databricks_sdk_utils.execute_databricks_sql("SELECT id FROM t")["data"] == [["1"], ["2"]]
+    assert fake.statements == ["SELECT id FROM t", "INSERT INTO t VALUES (2)", "SELECT id FROM t"]
+
+
+def test_large_results_are_not_cached(statement_execution, monkeypatch):
+    monkeypatch.setattr(databricks_sdk_utils, "_QUERY_CACHE_MAX_ROWS", 2)
+    fake = statement_execution(
+        lambda statement, **kwargs: _statement_response(["id"], [["1"], ["2"], ["3"]]),
+        lambda statement, **kwargs: _statement_response(["id"], [["1"], ["2"], ["3"]]),
+    )
+    databricks_sdk_utils.execute_databricks_sql("SELECT id FROM t")
+    databricks_sdk_utils.execute_databricks_sql("SELECT id FROM t")
+    assert len(fake.statements) == 2
+
+
+_LINEAGE_COLUMNS = [
+    "lineage_table", "source_table_full_name", "target_table_full_name", "entity_type", "entity_id",
+    "entity_run_id", "entity_metadata", "created_by", "event_time",
+]
+
+
+def _lineage_row(lineage_table, source, target, event_time):
+    return [lineage_table, source, target, "JOB", "1", "1", None, "me", event_time]
+
+
+def test_bulk_lineage_reads_every_chunk_and_buckets_rows_per_table(statement_execution):
+    def respond(statement, parameters, **kwargs):
+        assert [p.value for p in parameters] == ["c.s.a", "c.s.b", "c.s.c"]
+        return _statement_response(_LINEAGE_COLUMNS, [
+            _lineage_row("c.s.a", "c.s.a", "c.s.b", "3"),
+            _lineage_row("c.s.a", "c.s.a", "c.s.b", "2"),
+            _lineage_row("c.s.a", "c.s.x", "c.s.a", "1"),
+        ], next_chunk_index=1)
+
+    fake = statement_execution(respond, chunks=[
+        ResultData(data_array=[_lineage_row("c.s.b", "c.s.a", "c.s.b", "3")], next_chunk_index=2),
+        ResultData(data_array=[_lineage_row("c.s.b", "c.s.b", "c.s.b", "2")]),
+    ])
+    lineage = databricks_sdk_utils._get_tables_lineage_bulk(["c.s.a", "c.s.b", "c.s.c"])
+
+    assert len(fake.statements) == 1
+    assert lineage["c.s.a"]["downstream_tables"] == ["c.s.b"]
+    assert lineage["c.s.a"]["upstream_tables"] == ["c.s.x"]
+    assert lineage["c.s.b"]["upstream_tables"] == ["c.s.a"]
+    assert lineage["c.s.b"]["downstream_tables"] == []
+    assert lineage["c.s.c"] is databricks_sdk_utils._EMPTY_LINEAGE
+
+
+@pytest.fixture
+def statements_api(monkeypatch):
+    """Routes the async REST path to an httpx mock transport, returning the list of requests it saw"""
+    requests = []
+
+    def install(handler):
+        def record(request):
+            requests.append((request.method, request.url.path))
+            return handler(request)
+
+        monkeypatch.setattr(databricks_sdk_utils, "_new_async_http_client", lambda: httpx.AsyncClient(
+            transport=httpx.MockTransport(record), base_url=databricks_sdk_utils._DATABRICKS_BASE_URL
+        ))
+        monkeypatch.setattr(databricks_sdk_utils, "_STATEMENT_POLL_INITIAL_DELAY_SECONDS", 0)
+        return requests
+
+    databricks_sdk_utils.clear_query_cache()
+    yield install
+    asyncio.run(databricks_sdk_utils.close_async_http_client())
+    databricks_sdk_utils.clear_query_cache()
+
+
+_SUCCEEDED_STATEMENT = {
+    "statement_id": "s1",
+    "status": {"state": "SUCCEEDED"},
+    "manifest": {"schema": {"columns": [{"name": "id"}]}},
+    "result": {"data_array": [["1"]]},
+}
+
+
+def test_async_retries_rate_limited_requests(statements_api):
+    responses = [
+        httpx.Response(429, headers={"Retry-After": "0"}),
+        httpx.Response(503, headers={"Retry-After": "0"}),
+        httpx.Response(200, json={"statement_id": "s1", "status": {"state": "PENDING"}}),
+        httpx.Response(429, headers={"Retry-After": "0"}),
+        httpx.Response(200, json=_SUCCEEDED_STATEMENT),
+    ]
+    requests = statements_api(lambda request: responses.pop(0))
+    result = asyncio.run(databricks_sdk_utils.execute_databricks_sql_async("SELECT id FROM t"))
+    assert result["data"] == [["1"]]
+    assert [method for method, _ in requests] == ["POST", "POST", "POST", "GET", "GET"]
+
+
+def test_async_cancels_statement_when_polling_fails(statements_api):
+    def handler(request):
+        if request.method == "POST" and request.url.path.endswith("/cancel"):
+            return httpx.Response(200, json={})
+        if request.method == "POST":
+            return httpx.Response(200, json={"statement_id": "s1", "status": {"state": "RUNNING"}})
+        return httpx.Response(500, json={"message": "boom"})
+
+    requests = statements_api(handler)
+    result = asyncio.run(databricks_sdk_utils.execute_databricks_sql_async("SELECT id FROM t"))
+    assert result["status"] == "error"
+    assert requests[-1] == ("POST", "/api/2.0/sql/statements/s1/cancel")
+
+
+def test_async_queries_share_one_client(statements_api, monkeypatch):
+    statements_api(lambda request: httpx.Response(200, json=_SUCCEEDED_STATEMENT))
+    new_client = databricks_sdk_utils._new_async_http_client
+    clients = []
+
+    def record_client():
+        clients.append(new_client())
+        return clients[-1]
+
+    monkeypatch.setattr(databricks_sdk_utils, "_new_async_http_client", record_client)
+
+    async def run_queries():
+        return await asyncio.gather(*(
+            databricks_sdk_utils.execute_databricks_sql_async(f"SELECT {i}") for i in range(4)
+        ))
+
+    assert all(result["status"] == "success" for result in asyncio.run(run_queries()))
+    assert len(clients) == 1